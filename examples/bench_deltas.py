@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compares storing and validating every release's full distribution document
+against packaging.validation.deltas.DeltaStore, on a synthetic corpus of
+projects with many releases each.
+"""
+import gzip
+import io
+import json
+import random
+import sys
+import time
+
+from packaging.validation import validators
+from packaging.validation.deltas import DeltaStore
+
+
+CLASSIFIERS = [
+    "Development Status :: 5 - Production/Stable",
+    "Intended Audience :: Developers",
+    "License :: OSI Approved :: BSD License",
+    "Programming Language :: Python",
+    "Programming Language :: Python :: 2.7",
+    "Programming Language :: Python :: 3",
+]
+
+
+def corpus(projects, releases):
+    rng = random.Random(0)
+    documents = []
+    for p in range(projects):
+        requires = ["dependency%d (>=1.%d)" % (d, rng.randint(0, 9)) for d in range(rng.randint(0, 4))]
+        description = " ".join(["Paragraph %d of project %d." % (n, p) for n in range(50)])
+        for r in range(releases):
+            if requires and rng.random() < 0.2:
+                requires = list(requires)
+                requires[rng.randrange(len(requires))] = "dependency%d (>=2.%d)" % (rng.randint(0, 9), r)
+            documents.append({
+                "metadata": {
+                    "name": "project%d" % p,
+                    "version": "1.%d" % r,
+                    "summary": "Project number %d" % p,
+                    "description": description,
+                    "license": "BSD",
+                    "author": "Author %d" % p,
+                    "author-email": "author%d@example.com" % p,
+                    "classifiers": CLASSIFIERS,
+                    "uris": {"Home page": "http://example.com/project%d" % p},
+                },
+                "dependencies": {
+                    "requires": requires,
+                    "provides": ["project%d (1.%d)" % (p, r)],
+                },
+            })
+    return documents
+
+
+def timed(func, *args):
+    start = time.time()
+    result = func(*args)
+    return result, time.time() - start
+
+
+def sizes(text):
+    data = text.encode("utf-8")
+    return len(data), len(gzip.compress(data))
+
+
+if __name__ == "__main__":
+    projects = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    releases = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    documents = corpus(projects, releases)
+    print("{0:,} projects, {1:,} releases".format(projects, len(documents)))
+
+    _, full_validation = timed(lambda: [validators.distribution.validate(d) for d in documents])
+    store = DeltaStore()
+    errors, delta_validation = timed(store.extend, documents)
+    assert not any(errors)
+
+    full = "".join([json.dumps(d, sort_keys=True, separators=(",", ":")) + "\n" for d in documents])
+    buffer = io.StringIO()
+    store.dump(buffer)
+
+    print("validation   full {0:8.2f}s   deltas {1:8.2f}s".format(full_validation, delta_validation))
+    print("size         full {0:>12,} bytes ({1:,} gzipped)".format(*sizes(full)))
+    print("             deltas {0:>10,} bytes ({1:,} gzipped)".format(*sizes(buffer.getvalue())))
+
+    names = [(d["metadata"]["name"], d["metadata"]["version"]) for d in documents]
+    _, elapsed = timed(lambda: [store.get(n, v) for n, v in names])
+    print("rebuild      {0:8.1f}us per release".format(elapsed / len(names) * 1000000))
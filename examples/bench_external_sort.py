@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Sorts and deduplicates a synthetic stream of (project, version) rows, 50
+million by default, with packaging.version.external_sort_versions and
+reports the time taken and the peak memory used.
+"""
+import random
+import resource
+import sys
+import time
+
+from packaging.version import RUN_SIZE, external_sort_versions
+
+
+def generate(count, projects=200000, seed=0):
+    rng = random.Random(seed)
+    suffixes = ["", "", "", "", ".0", "a1", "b2", "c1", ".dev3", ".post1"]
+    for _ in range(count):
+        yield (
+            "project%d" % rng.randrange(projects),
+            "%d.%d%s" % (rng.randint(0, 9), rng.randint(0, 40), rng.choice(suffixes)),
+        )
+
+
+def peak_memory():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000000
+    run_size = int(sys.argv[2]) if len(sys.argv) > 2 else RUN_SIZE
+
+    start = time.time()
+    unique = 0
+    for _ in external_sort_versions(generate(count), run_size=run_size, dedupe=True):
+        unique += 1
+    elapsed = time.time() - start
+
+    print("{0:,} rows, {1:,} unique, run size {2:,}".format(count, unique, run_size))
+    print("{0:.1f}s ({1:,.0f} rows/s), peak memory {2:,.0f}MB".format(elapsed, count / elapsed, peak_memory()))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Compares packaging.pkginfo against parsing PKG-INFO files with the stdlib
+email package.
+"""
+import email.parser
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from packaging import pkginfo
+
+
+TEMPLATE = """Metadata-Version: 1.1
+Name: project{i}
+Version: 1.{i}
+Summary: Project number {i}
+Home-page: http://example.com/project{i}
+Author: Author {i}
+Author-email: author{i}@example.com
+License: BSD
+Description: {description}
+Keywords: one, two, three
+Platform: any
+Classifier: Development Status :: 5 - Production/Stable
+Classifier: Intended Audience :: Developers
+Classifier: Programming Language :: Python
+"""
+
+DESCRIPTION = "\n        ".join(["Line %d of a long description." % n for n in range(200)])
+
+
+def parse_with_email(path):
+    with open(path, "rb") as fp:
+        message = email.parser.BytesParser().parse(fp)
+
+    data = {
+        "name": message["Name"],
+        "version": message["Version"],
+        "summary": message["Summary"],
+        "description": message["Description"],
+        "author": message["Author"],
+        "author-email": message["Author-email"],
+        "license": message["License"],
+        "keywords": [k.strip() for k in message["Keywords"].split(",")],
+        "platforms": message.get_all("Platform"),
+        "classifiers": message.get_all("Classifier"),
+        "uris": {"Home page": message["Home-page"]},
+    }
+    return data
+
+
+def bench(name, func, paths):
+    start = time.time()
+    for path in paths:
+        func(path)
+    elapsed = time.time() - start
+    print("{0:<20} {1:8.3f}s {2:10,.0f} files/s".format(name, elapsed, len(paths) / elapsed))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    directory = tempfile.mkdtemp()
+    try:
+        paths = []
+        for i in range(count):
+            path = os.path.join(directory, "%d.PKG-INFO" % i)
+            with open(path, "w") as fp:
+                fp.write(TEMPLATE.format(i=i, description=DESCRIPTION))
+            paths.append(path)
+
+        bench("email", parse_with_email, paths)
+        bench("packaging.pkginfo", pkginfo.parse_file, paths)
+    finally:
+        shutil.rmtree(directory)
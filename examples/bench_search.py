@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Measures query latency of packaging.index.search.SearchIndex against a
+substring scan over the metadata, by default over 500,000 releases.
+"""
+import random
+import sys
+import time
+
+from packaging.index.search import SearchIndex
+
+
+WORDS = [
+    "http", "client", "server", "async", "json", "parser", "django", "flask", "test", "mock",
+    "data", "science", "image", "web", "framework", "database", "orm", "sql", "cli", "tool",
+    "crypto", "network", "yaml", "config", "logging", "plugin", "api", "wrapper", "fast", "simple",
+] + ["word%d" % i for i in range(5000)]
+
+QUERIES = ["json parser", "django plugin", "async http client", "web*", "word12*", "sql orm"]
+
+
+def releases(count):
+    rng = random.Random(0)
+    for i in range(count):
+        yield {
+            "name": "%s-%s-%d" % (rng.choice(WORDS), rng.choice(WORDS), i // 5),
+            "version": "1.%d" % (i % 5),
+            "summary": " ".join([rng.choice(WORDS) for _ in range(8)]).capitalize(),
+            "keywords": [rng.choice(WORDS) for _ in range(3)],
+        }
+
+
+def scan(documents, query):
+    terms = [t.rstrip("*") for t in query.lower().split()]
+    found = []
+    for data in documents:
+        text = " ".join([data["name"], data["summary"]] + data["keywords"]).lower()
+        if all([t in text for t in terms]):
+            found.append((data["name"], data["version"]))
+    return found
+
+
+def timed(func, *args):
+    start = time.time()
+    result = func(*args)
+    return result, time.time() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+
+    documents = list(releases(count))
+    index, elapsed = timed(SearchIndex, documents)
+    print("indexed {0:,} releases in {1:.1f}s".format(count, elapsed))
+
+    for query in QUERIES:
+        found, indexed = timed(index.search, query)
+        _, top = timed(index.top, query, 10)
+        _, scanned = timed(scan, documents, query)
+        print("{0:<20} {1:8,} hits  search {2:8.1f}ms  top 10 {3:8.1f}ms  scan {4:8.1f}ms".format(
+            query, len(found), indexed * 1000, top * 1000, scanned * 1000,
+        ))
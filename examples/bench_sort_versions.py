@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Compares sorting version strings through Version objects against
+packaging.version.sort_versions/max_version/dedupe_versions.
+"""
+import random
+import sys
+import time
+
+from packaging.version import Version, sort_versions, max_version, dedupe_versions
+
+
+def generate(count, seed=0):
+    rng = random.Random(seed)
+    suffixes = ["", "", "", "a1", "b2", "c1", ".dev3", ".post1", ".post2.dev1"]
+    return [
+        "%d.%d.%d%s" % (rng.randint(0, 20), rng.randint(0, 30), rng.randint(0, 10), rng.choice(suffixes))
+        for _ in range(count)
+    ]
+
+
+def bench(name, func, *args):
+    start = time.time()
+    func(*args)
+    print("{0:<40} {1:8.3f}s".format(name, time.time() - start))
+
+
+def sort_objects(strings):
+    return [str(v) for v in sorted([Version(s) for s in strings])]
+
+
+def max_objects(strings):
+    return str(max([Version(s) for s in strings]))
+
+
+def dedupe_objects(strings):
+    seen = set()
+    unique = []
+    for string in strings:
+        version = Version(string)
+        if version not in seen:
+            seen.add(version)
+            unique.append(string)
+    return unique
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    strings = generate(count)
+
+    bench("sorted(Version)", sort_objects, strings)
+    bench("sort_versions", sort_versions, strings)
+    bench("max(Version)", max_objects, strings)
+    bench("max_version", max_version, strings)
+    bench("set(Version)", dedupe_objects, strings)
+    bench("dedupe_versions", dedupe_versions, strings)
@@ -3,7 +3,7 @@
 Checks packaging.version against PyPI and setuptools/distribute
 """
 from distutils.version import StrictVersion, LooseVersion
-from packaging.version import Version, suggest
+from packaging.version import Version, parse, suggest
 from pkg_resources import parse_version
 from xmlrpclib import ServerProxy
 
@@ -23,7 +23,6 @@ results = {
     "ordering": {
         "valid": set(),
         "invalid": set(),
-        "unknown": set(),
     },
 }
 
@@ -59,27 +58,8 @@ for package, ver in progress.bar.ShadyBar("Trying packaging.version", max=len(al
 
 
 for package, versions in progress.bar.ShadyBar("Check version ordering", max=len(package_versions)).iter(package_versions):
-    pvers = []
-
-    valid = True
-
-    for v in versions:
-        try:
-            pvers.append((v, Version(v)))
-        except ValueError:
-            suggested = suggest(v)
-
-            try:
-                pvers.append((v, Version(suggested)))
-            except (ValueError, TypeError):
-                # Can't order this set
-                results["ordering"]["unknown"].add((package, tuple(versions)))
-                valid = False
-                break
-
-    if not valid:
-        continue
-
+    # Versions we can't parse are ordered as LegacyVersion, before the rest
+    pvers = [(v, parse(v)) for v in versions]
     rvers = [(v, parse_version(v)) for v in versions]
 
     # Sort the lists
@@ -104,5 +84,4 @@ print "ordering"
 print "========"
 print "  Valid: {}".format(len(results["ordering"]["valid"]))
 print "  Invalid: {}".format(len(results["ordering"]["invalid"]))
-print "  Unknown: {}".format(len(results["ordering"]["unknown"]))
-print "  Total: {}".format(len(results["ordering"]["valid"]) + len(results["ordering"]["invalid"]) + len(results["ordering"]["unknown"]))
+print "  Total: {}".format(len(results["ordering"]["valid"]) + len(results["ordering"]["invalid"]))
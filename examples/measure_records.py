@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Compares the memory held by validated distributions as plain dicts against
+the slotted records from packaging.validation.records.
+"""
+import gc
+import sys
+import tracemalloc
+
+from packaging.validation import validators
+
+
+LICENSES = ["BSD", "MIT License", "Apache License, Version 2.0", "GPLv3"]
+CLASSIFIERS = [
+    "Development Status :: 5 - Production/Stable",
+    "Intended Audience :: Developers",
+    "Programming Language :: Python",
+    "Programming Language :: Python :: 2.7",
+    "Programming Language :: Python :: 3",
+]
+
+
+def document(i):
+    # Build every string from scratch, the way a JSON decoder would
+    return {
+        "metadata": {
+            "name": "project%d" % i,
+            "version": "1.%d" % (i % 100),
+            "summary": "Project number %d" % i,
+            "license": "".join(LICENSES[i % len(LICENSES)]),
+            "author": "".join("Author %d" % (i % 50)),
+            "classifiers": ["".join(c) for c in CLASSIFIERS],
+            "platforms": ["".join("any")],
+        },
+        "dependencies": {
+            "requires": ["dependency%d (>=1.0)" % (i % 1000)],
+            "provides": ["project%d (1.%d)" % (i, i % 100)],
+        },
+    }
+
+
+def measure(validator, count):
+    gc.collect()
+    tracemalloc.start()
+    held = [validator.validate(document(i)) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    as_dicts = measure(validators.distribution, count)
+    as_records = measure(validators.distribution_record, count)
+
+    print("dicts:   {0:>12,} bytes ({1:,.0f} per distribution)".format(as_dicts, as_dicts / float(count)))
+    print("records: {0:>12,} bytes ({1:,.0f} per distribution)".format(as_records, as_records / float(count)))
+    print("saved:   {0:.1%}".format(1 - as_records / float(as_dicts)))
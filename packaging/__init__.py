@@ -0,0 +1,39 @@
+import sys
+
+__all__ = ["Version", "VersionPredicate", "suggest", "normalize_name", "validators"]
+
+# Attributes of the top level namespace, and the module that defines them.
+# Nothing is imported until the attribute is first accessed so that
+# ``import packaging`` stays cheap for tools that only need part of it.
+_lazy = {
+    "Version": ("packaging.version", "Version"),
+    "VersionPredicate": ("packaging.version", "VersionPredicate"),
+    "suggest": ("packaging.version", "suggest"),
+    "normalize_name": ("packaging.utils", "normalize_name"),
+    "validators": ("packaging.validation.validators", None),
+}
+
+
+def __getattr__(name):
+    try:
+        module, attr = _lazy[name]
+    except KeyError:
+        raise AttributeError("module '{module}' has no attribute '{name}'".format(module=__name__, name=name))
+
+    value = __import__(module, fromlist=["__name__"])
+    if attr is not None:
+        value = getattr(value, attr)
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
+
+
+if sys.version_info < (3, 7):
+    # Module level __getattr__ is not supported, fall back to importing
+    # everything up front.
+    for _name in __all__:
+        __getattr__(_name)
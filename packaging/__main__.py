@@ -0,0 +1,214 @@
+"""
+Bulk version and metadata operations on line oriented input.
+
+    python -m packaging normalize < versions.txt
+    python -m packaging sort --reverse < versions.txt
+    python -m packaging filter --predicate "foo (>=1.0,<2.0)" < versions.txt
+    python -m packaging validate --jobs 4 < distributions.jsonl
+
+Input is read from stdin and output written to stdout in batches. With
+``--jobs N`` batches are processed by a pool of N processes, with at most
+2N batches in flight so memory stays bounded however large the input is
+(except for ``sort``, which has to see every line unless ``--external``
+is given). Problems with individual lines are reported on stderr and make
+the exit status 1.
+"""
+import argparse
+import collections
+import functools
+import itertools
+import json
+import sys
+
+from .version import RUN_SIZE, VersionPredicate, Version, external_sort_versions, sort_versions, suggest
+
+__all__ = ["main"]
+
+BATCH_SIZE = 10000
+
+
+def _lines(stream):
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if line:
+            yield number, line
+
+
+def _batches(lines, size):
+    lines = iter(lines)
+    while True:
+        batch = list(itertools.islice(lines, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _normalize(batch):
+    output, errors = [], []
+    for number, line in batch:
+        normalized = suggest(line)
+        if normalized is None:
+            errors.append("line {number}: invalid version '{line}'".format(number=number, line=line))
+        else:
+            output.append(normalized)
+    return output, errors
+
+
+def _filter(predicate, batch):
+    predicate = VersionPredicate(predicate)
+
+    output, errors = [], []
+    for number, line in batch:
+        try:
+            version = Version(line)
+        except ValueError as exc:
+            errors.append("line {number}: {error}".format(number=number, error=exc))
+            continue
+        if predicate.match(version):
+            output.append(line)
+    return output, errors
+
+
+def _validate(batch):
+    from .validation import validators
+
+    output, errors = [], []
+    for number, line in batch:
+        result = {"line": number, "valid": True}
+        try:
+            validators.distribution.validate(json.loads(line))
+        except (ValueError, validators.SchemaError) as exc:
+            result.update(valid=False, error=str(exc))
+            errors.append("line {number}: invalid distribution".format(number=number))
+        output.append(json.dumps(result, sort_keys=True))
+    return output, errors
+
+
+def _map(func, batches, jobs):
+    """
+    Yield ``func(batch)`` for every batch, in order, using a pool of
+    ``jobs`` processes if there is more than one.
+    """
+    if jobs <= 1:
+        for batch in batches:
+            yield func(batch)
+        return
+
+    import multiprocessing
+
+    pool = multiprocessing.Pool(jobs)
+    try:
+        pending = collections.deque()
+        for batch in batches:
+            pending.append(pool.apply_async(func, (batch,)))
+            if len(pending) >= jobs * 2:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+
+
+def _run(func, args, stdin, stdout, stderr):
+    failed = False
+    for output, errors in _map(func, _batches(_lines(stdin), args.batch_size), args.jobs):
+        if output:
+            stdout.write("\n".join(output) + "\n")
+        for error in errors:
+            stderr.write(error + "\n")
+            failed = True
+    return 1 if failed else 0
+
+
+def _external_sort(args, stdin, stdout, stderr):
+    versions = external_sort_versions(
+        (line for _, line in _lines(stdin)),
+        run_size=RUN_SIZE if args.external else None,
+        dedupe=args.unique, skip_invalid=args.skip_invalid, fuzzy=args.fuzzy,
+    )
+    try:
+        for batch in _batches(versions, args.batch_size):
+            stdout.write("\n".join(batch) + "\n")
+    except ValueError as exc:
+        stderr.write("{error}\n".format(error=exc))
+        return 1
+    return 0
+
+
+def _sort(args, stdin, stdout, stderr):
+    if args.external or args.unique:
+        return _external_sort(args, stdin, stdout, stderr)
+
+    versions = [line for _, line in _lines(stdin)]
+    try:
+        versions = sort_versions(
+            versions, reverse=args.reverse, skip_invalid=args.skip_invalid, fuzzy=args.fuzzy, legacy=args.legacy,
+        )
+    except ValueError as exc:
+        stderr.write("{error}\n".format(error=exc))
+        return 1
+
+    for start in range(0, len(versions), args.batch_size):
+        stdout.write("\n".join(versions[start:start + args.batch_size]) + "\n")
+    return 0
+
+
+def _parser():
+    parser = argparse.ArgumentParser(prog="python -m packaging", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="lines processed per batch")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="number of worker processes")
+
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    commands.add_parser("normalize", help="normalize versions with suggest()")
+    # argparse only supports aliases on Python 3
+    commands.add_parser("parse", help="same as normalize")
+
+    sort = commands.add_parser("sort", help="sort versions")
+    sort.add_argument("--reverse", "-r", action="store_true", help="newest first")
+    sort.add_argument("--skip-invalid", action="store_true", help="drop invalid versions instead of failing")
+    sort.add_argument("--fuzzy", action="store_true", help="sort invalid versions by what suggest() makes of them")
+    sort.add_argument("--legacy", action="store_true", help="sort invalid versions first, the way setuptools does")
+    sort.add_argument("--unique", "-u", action="store_true", help="only output one of equal versions")
+    sort.add_argument("--external", action="store_true", help="spill sorted runs to temporary files to bound memory")
+
+    filter_ = commands.add_parser("filter", help="keep the versions matching a predicate")
+    filter_.add_argument("--predicate", "-p", required=True, help='e.g. "foo (>=1.0,<2.0)"')
+
+    commands.add_parser("validate", help="validate JSON Lines distributions")
+
+    return parser
+
+
+def main(argv=None, stdin=None, stdout=None, stderr=None):
+    stdin = sys.stdin if stdin is None else stdin
+    stdout = sys.stdout if stdout is None else stdout
+    stderr = sys.stderr if stderr is None else stderr
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "sort" and (args.external or args.unique) and (args.reverse or args.legacy):
+        parser.error("--external and --unique can't be combined with --reverse or --legacy")
+
+    if args.command == "sort":
+        return _sort(args, stdin, stdout, stderr)
+
+    if args.command == "filter":
+        try:
+            VersionPredicate(args.predicate)
+        except ValueError as exc:
+            stderr.write("{error}\n".format(error=exc))
+            return 2
+        func = functools.partial(_filter, args.predicate)
+    elif args.command == "validate":
+        func = _validate
+    else:
+        func = _normalize
+
+    return _run(func, args, stdin, stdout, stderr)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,255 @@
+"""
+asyncio wrappers around validation and version parsing.
+
+Validating a large distribution, or parsing thousands of versions, is CPU
+bound and would block the event loop if done inline. Everything here hands
+the work to an executor (the loop's default thread pool unless one is
+given) in batches.
+
+Schemas can be given either as a Schema object or as the name of one of the
+schemas in packaging.validation.validators (e.g. "distribution"). Only the
+latter works with a ProcessPoolExecutor, as the schemas themselves hold
+lambdas and can't be pickled.
+
+Requires Python 3.7+.
+"""
+import asyncio
+import itertools
+
+from .compat import string_type
+from .validation import validators
+from .validation.schema import SchemaError
+from .version import Version
+
+__all__ = ["AsyncValidator", "validate_async", "iter_validate", "parse_versions_async"]
+
+
+def _resolve(schema):
+    if isinstance(schema, string_type):
+        return getattr(validators, schema)
+    return schema
+
+
+def _validate_batch(schema, documents):
+    schema = _resolve(schema)
+
+    results = []
+    for document in documents:
+        try:
+            results.append((True, schema.validate(document)))
+        except SchemaError as exc:
+            # SchemaError can't be pickled, send back what is needed to
+            # rebuild it on the other side
+            results.append((False, (exc.autos, exc.errors)))
+    return results
+
+
+def _unwrap(result):
+    ok, value = result
+    if not ok:
+        raise SchemaError(*value)
+    return value
+
+
+def _parse_batch(strings):
+    return [Version(s) for s in strings]
+
+
+async def validate_async(document, schema="distribution", executor=None):
+    """
+    Validate a single document without blocking the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(executor, _validate_batch, schema, [document])
+    return _unwrap(results[0])
+
+
+async def parse_versions_async(strings, executor=None, batch_size=1000, max_pending=4):
+    """
+    Parse an iterable of version strings into Version objects, a batch at a
+    time. Raises ValueError for the first invalid version.
+
+    As with iter_validate(), at most ``max_pending`` batches are submitted
+    to the executor at a time and ``strings`` is only consumed as they
+    complete.
+    """
+    loop = asyncio.get_running_loop()
+    strings = iter(strings)
+    pending = []
+
+    versions = []
+    try:
+        while True:
+            batch = list(itertools.islice(strings, batch_size))
+            if not batch:
+                break
+            pending.append(loop.run_in_executor(executor, _parse_batch, batch))
+            if len(pending) >= max_pending:
+                versions.extend(await pending.pop(0))
+
+        while pending:
+            versions.extend(await pending.pop(0))
+    finally:
+        for future in pending:
+            future.cancel()
+    return versions
+
+
+async def iter_validate(documents, schema="distribution", executor=None, batch_size=64, max_pending=4):
+    """
+    Validate an iterable (or async iterable) of documents, yielding
+    ``(valid, result)`` pairs in input order where ``result`` is either the
+    validated document or the SchemaError.
+
+    At most ``max_pending`` batches are submitted to the executor ahead of
+    the consumer, so memory stays bounded however long the input is.
+    """
+    loop = asyncio.get_running_loop()
+    pending = []
+
+    async def batches():
+        batch = []
+        if hasattr(documents, "__aiter__"):
+            async for document in documents:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        else:
+            for document in documents:
+                batch.append(document)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def flush(results):
+        for ok, value in results:
+            yield (True, value) if ok else (False, SchemaError(*value))
+
+    try:
+        async for batch in batches():
+            pending.append(loop.run_in_executor(executor, _validate_batch, schema, batch))
+            if len(pending) >= max_pending:
+                for item in flush(await pending.pop(0)):
+                    yield item
+
+        while pending:
+            for item in flush(await pending.pop(0)):
+                yield item
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+class AsyncValidator(object):
+    """
+    Coalesces concurrent ``validate()`` calls into batches.
+
+    Requests are put on a queue holding at most ``max_pending`` documents;
+    once it is full callers wait, which applies backpressure to whatever is
+    producing them. Up to ``concurrency`` batches of at most ``batch_size``
+    documents are handed to the executor at a time.
+
+    Use it as an async context manager, or call ``close()`` when done. Once
+    closed, ``validate()`` raises RuntimeError.
+    """
+
+    def __init__(self, schema="distribution", executor=None, batch_size=64, max_pending=1024, concurrency=4):
+        self.schema = schema
+        self.executor = executor
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.concurrency = concurrency
+
+        self._queue = None
+        self._workers = []
+        # The puts of callers waiting for room in the queue
+        self._putters = set()
+        self._closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def validate(self, document):
+        if self._closed:
+            raise RuntimeError("AsyncValidator is closed")
+
+        if self._queue is None:
+            # Created lazily so it is bound to the running loop
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._workers = [asyncio.ensure_future(self._work()) for _ in range(self.concurrency)]
+
+        future = asyncio.get_running_loop().create_future()
+        put = asyncio.ensure_future(self._queue.put((document, future)))
+        self._putters.add(put)
+        try:
+            await put
+        finally:
+            self._putters.discard(put)
+        return await future
+
+    async def close(self):
+        """
+        Stop the workers and cancel any request that hasn't completed,
+        including those still waiting for room in the queue.
+        """
+        self._closed = True
+
+        putters = list(self._putters)
+        for put in putters:
+            put.cancel()
+        await asyncio.gather(*putters, return_exceptions=True)
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+            self._queue = None
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            # Callers that were cancelled while waiting don't need validating
+            batch = [(d, f) for d, f in batch if not f.done()]
+            if not batch:
+                continue
+
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, _validate_batch, self.schema, [d for d, _ in batch],
+                )
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    future.cancel()
+                raise
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                try:
+                    future.set_result(_unwrap(result))
+                except Exception as exc:
+                    future.set_exception(exc)
@@ -0,0 +1,125 @@
+import fnmatch
+import os
+import tarfile
+import zipfile
+
+from . import pkginfo
+
+__all__ = ["read_metadata", "iter_archives"]
+
+# Refuse to read metadata members larger than this
+MAX_METADATA_SIZE = 16 * 1024 * 1024
+
+ARCHIVE_PATTERNS = ("*.whl", "*.egg", "*.zip", "*.tar.gz", "*.tgz", "*.tar.bz2", "*.tar")
+
+
+def _metadata_rank(name):
+    """
+    Return how good a metadata member ``name`` is, lower being better, or
+    None if it isn't one: 0 for the ``*.dist-info/METADATA`` of a wheel, 1
+    for the ``EGG-INFO/PKG-INFO`` of an egg and 2 for the
+    ``<top level directory>/PKG-INFO`` of an sdist.
+    """
+    name = name.strip("/")
+    while name.startswith("./"):
+        name = name[2:].lstrip("/")
+
+    parts = name.split("/")
+    if len(parts) != 2:
+        return None
+    directory, filename = parts
+    if directory.endswith(".dist-info"):
+        return 0 if filename == "METADATA" else None
+    if filename != "PKG-INFO":
+        return None
+    return 1 if directory == "EGG-INFO" else 2
+
+
+def _check_size(path, name, size, max_size):
+    if size > max_size:
+        raise ValueError("Metadata '{name}' in '{path}' is {size} bytes, larger than the limit of {max_size}".format(
+            name=name, path=path, size=size, max_size=max_size,
+        ))
+
+
+def _read_zip(path, max_size):
+    # The member is located through the central directory and is the only
+    # one that gets decompressed. Wheels may hold other PKG-INFO files (of
+    # vendored projects, say), only their .dist-info/METADATA counts
+    best, best_rank = None, None
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            rank = _metadata_rank(info.filename)
+            if rank is None or (path.endswith(".whl") and rank != 0):
+                continue
+            if best_rank is None or rank < best_rank:
+                best, best_rank = info, rank
+
+        if best is None:
+            return None
+
+        _check_size(path, best.filename, best.file_size, max_size)
+        fp = archive.open(best)
+        try:
+            return pkginfo.parse_distribution(fp)
+        finally:
+            fp.close()
+
+
+def _read_tar(path, max_size):
+    # Stream mode only reads forward: headers of the members before the
+    # metadata are read (which for compressed archives means decompressing
+    # them) but their contents are skipped, and nothing after it is touched
+    archive = tarfile.open(path, "r|*")
+    try:
+        for member in archive:
+            if member.isfile() and _metadata_rank(member.name) is not None:
+                _check_size(path, member.name, member.size, max_size)
+                return pkginfo.parse_distribution(archive.extractfile(member))
+    finally:
+        archive.close()
+
+
+def read_metadata(path, max_size=None):
+    """
+    Return the distribution dict, ready for validators.distribution, read
+    from the metadata inside the wheel, egg or sdist at ``path`` without
+    unpacking the archive.
+    """
+    if max_size is None:
+        max_size = MAX_METADATA_SIZE
+
+    if zipfile.is_zipfile(path):
+        data = _read_zip(path, max_size)
+    else:
+        data = _read_tar(path, max_size)
+
+    if data is None:
+        raise ValueError("No metadata found in '{path}'".format(path=path))
+
+    return data
+
+
+def iter_archives(path, patterns=ARCHIVE_PATTERNS, validator=None, max_size=None):
+    """
+    Walk ``path`` reading the metadata of every archive matching one of
+    ``patterns``, yielding ``(filename, ok, result)`` for each.
+
+    ``result`` is the distribution dict, run through ``validator`` if one is
+    given, or the exception raised while reading or validating it.
+    """
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            if not any([fnmatch.fnmatch(filename, p) for p in patterns]):
+                continue
+
+            filename = os.path.join(root, filename)
+            try:
+                result = read_metadata(filename, max_size=max_size)
+                if validator is not None:
+                    result = validator.validate(result)
+            except Exception as exc:
+                yield filename, False, exc
+            else:
+                yield filename, True, result
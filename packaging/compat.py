@@ -10,12 +10,14 @@ if PY3:
     class_types = type,
     text_type = str
     binary_type = bytes
+    intern = sys.intern
 else:
     string_type = basestring
     integer_types = (int, long)
     class_types = (type, types.ClassType)
     text_type = unicode
     binary_type = str
+    intern = intern
 
 try:
     from functools import total_ordering
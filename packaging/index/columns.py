@@ -0,0 +1,384 @@
+"""
+A columnar store of validated metadata for index wide queries such as
+"how many releases use license X" or "which releases list platform Y".
+
+Every stored field is a column of integer codes into a dictionary of the
+distinct strings used in it, so a license shared by 100,000 releases is
+kept once and counting its releases is a single ``array.count``. Fields
+holding lists (classifiers, platforms...) store the codes of every release
+back to back plus the offset where each release starts.
+
+Layout of a saved store (integers in headers are unsigned 32 bit big
+endian, columns are unsigned 32 bit little endian arrays, aligned to 4
+bytes so they can be read straight out of an mmap):
+
+    header      "PMC1", number of rows, number of fields
+    fields      (name offset, name length, is multi, strings offset, string
+                count, codes offset, code count, offsets offset) per field
+    data        names, dictionaries (string count + 1 offsets followed by
+                the UTF-8 strings) and columns
+"""
+import array
+import bisect
+import collections
+import mmap
+import struct
+import sys
+
+from ..version import Version
+
+__all__ = ["SCALAR_FIELDS", "MULTI_FIELDS", "ColumnStore"]
+
+MAGIC = b"PMC1"
+
+# The metadata fields kept, summary and description are too unique to
+# benefit from a dictionary and aren't useful to query on
+SCALAR_FIELDS = ("name", "version", "license", "author", "author-email", "maintainer", "maintainer-email")
+MULTI_FIELDS = ("keywords", "classifiers", "platforms", "supported-platforms")
+
+_HEADER = struct.Struct(">4sII")
+_FIELD = struct.Struct(">IIIIIIII")
+
+_TYPECODE = "I"
+assert array.array(_TYPECODE).itemsize == 4
+
+
+def _array(values=()):
+    return array.array(_TYPECODE, values)
+
+
+def _to_bytes(values):
+    if sys.byteorder == "big":
+        values = _array(values)
+        values.byteswap()
+    return values.tobytes() if hasattr(values, "tobytes") else values.tostring()
+
+
+def _from_bytes(data):
+    values = _array()
+    if hasattr(values, "frombytes"):
+        values.frombytes(data)
+    else:
+        values.fromstring(data.tobytes() if isinstance(data, memoryview) else data)
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def _from_view(view):
+    """
+    Return the integers of a column from ``view``, read in place when the
+    platform allows it (Python 3 on a little endian machine) and copied
+    into an array otherwise.
+    """
+    if sys.byteorder == "little" and hasattr(view, "cast"):
+        return view.cast(_TYPECODE)
+    return _from_bytes(view)
+
+
+class _Column(object):
+    """
+    The codes of one field and the dictionary they index into. Code 0 is
+    reserved for a missing value.
+
+    A column read from a saved store is only decoded the first time it is
+    used, so opening a store costs nothing per row, and where possible its
+    codes and offsets stay in the buffer (see _from_view) until a row is
+    added.
+    """
+
+    def __init__(self, multi, source=None):
+        self.multi = multi
+        self._source = source
+        self._lookup = None
+        if source is None:
+            self._strings = [None]
+            self._codes = _array()
+            self._offsets = _array([0]) if multi else None
+
+    def _load(self):
+        view, strings_offset, string_count, codes_offset, code_count, offsets_offset = self._source
+        self._source = None
+
+        bounds = _from_view(view[strings_offset:strings_offset + 4 * (string_count + 1)])
+        start = strings_offset + 4 * (string_count + 1)
+        self._strings = [None] + [
+            view[start + bounds[i]:start + bounds[i + 1]].tobytes().decode("utf-8") for i in range(string_count)
+        ]
+        self._codes = _from_view(view[codes_offset:codes_offset + 4 * code_count])
+        if self.multi:
+            self._offsets = _from_view(view[offsets_offset:])
+        else:
+            self._offsets = None
+
+    @property
+    def strings(self):
+        if self._source is not None:
+            self._load()
+        return self._strings
+
+    @property
+    def codes(self):
+        if self._source is not None:
+            self._load()
+        return self._codes
+
+    @property
+    def offsets(self):
+        if self._source is not None:
+            self._load()
+        return self._offsets
+
+    def code(self, value):
+        """
+        Return the code of ``value``, or None if no row uses it.
+        """
+        if self._lookup is None:
+            self._lookup = dict([(s, i) for i, s in enumerate(self.strings) if i])
+        return self._lookup.get(value)
+
+    def _encode(self, value):
+        code = self.code(value)
+        if code is None:
+            code = len(self._strings)
+            self._strings.append(value)
+            self._lookup[value] = code
+        return code
+
+    def count(self, code):
+        codes = self.codes
+        if isinstance(codes, array.array):
+            return codes.count(code)
+        # A memoryview has no count(), tolist() still loops in C
+        return codes.tolist().count(code)
+
+    def _thaw(self):
+        # Codes read in place from a buffer are copied before changing them
+        if not isinstance(self.codes, array.array):
+            self._codes = _array(self._codes)
+        if self.multi and not isinstance(self._offsets, array.array):
+            self._offsets = _array(self._offsets)
+
+    def append(self, value):
+        self._thaw()
+        if not self.multi:
+            self.codes.append(0 if value is None else self._encode(value))
+            return
+
+        codes = []
+        for item in value or ():
+            code = self._encode(item)
+            if code not in codes:
+                codes.append(code)
+        self.codes.extend(codes)
+        self.offsets.append(len(self.codes))
+
+    def value(self, row):
+        if not self.multi:
+            return self.strings[self.codes[row]]
+        offsets = self.offsets
+        return [self.strings[c] for c in self.codes[offsets[row]:offsets[row + 1]]]
+
+    def rows(self, code):
+        codes = self.codes
+        if not self.multi:
+            return [i for i, c in enumerate(codes) if c == code]
+        # A code appears at most once per row, map each position back to
+        # the row it belongs to
+        offsets = self.offsets
+        return [bisect.bisect_right(offsets, i) - 1 for i, c in enumerate(codes) if c == code]
+
+
+class ColumnStore(object):
+    """
+    Holds the metadata of many releases, one row per release, as dictionary
+    encoded columns (see the module docstring).
+    """
+
+    def __init__(self, records=()):
+        self._rows = 0
+        self._columns = collections.OrderedDict()
+        for field in SCALAR_FIELDS:
+            self._columns[field] = _Column(False)
+        for field in MULTI_FIELDS:
+            self._columns[field] = _Column(True)
+
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return self._rows
+
+    @property
+    def fields(self):
+        return list(self._columns)
+
+    def _column(self, field):
+        try:
+            return self._columns[field]
+        except KeyError:
+            raise ValueError("Unknown field '{field}'".format(field=field))
+
+    def add(self, metadata):
+        """
+        Append a row for ``metadata``, a dict validated by
+        validators.metadata or a records.Metadata, and return its number.
+        """
+        if hasattr(metadata, "as_dict"):
+            metadata = metadata.as_dict()
+
+        for field, column in self._columns.items():
+            value = metadata.get(field)
+            if isinstance(value, Version):
+                value = str(value)
+            column.append(value)
+
+        self._rows += 1
+        return self._rows - 1
+
+    def row(self, row):
+        """
+        Return the stored fields of ``row`` as a dict, leaving out missing
+        ones.
+        """
+        if not 0 <= row < self._rows:
+            raise IndexError(row)
+
+        data = {}
+        for field, column in self._columns.items():
+            value = column.value(row)
+            if value:
+                data[field] = value
+        return data
+
+    def count(self, field, value):
+        """
+        Return the number of rows where ``field`` is (or, for list fields,
+        contains) ``value``.
+        """
+        column = self._column(field)
+        code = column.code(value)
+        return 0 if code is None else column.count(code)
+
+    def where(self, field, value):
+        """
+        Return the numbers of the rows where ``field`` is (or contains)
+        ``value``, in order.
+        """
+        column = self._column(field)
+        code = column.code(value)
+        return [] if code is None else column.rows(code)
+
+    def select(self, conditions):
+        """
+        Return the numbers of the rows matching every ``field: value`` of
+        ``conditions``, in order.
+        """
+        rows = None
+        # Start from the rarest value so the intersection stays small
+        for field, value in sorted(conditions.items(), key=lambda c: self.count(*c)):
+            found = self.where(field, value)
+            rows = set(found) if rows is None else rows.intersection(found)
+            if not rows:
+                return []
+        return sorted(rows) if rows is not None else list(range(self._rows))
+
+    def counts(self, field):
+        """
+        Return a dict of the number of rows using each value of ``field``.
+        """
+        column = self._column(field)
+        strings = column.strings
+        counted = collections.Counter(column.codes)
+        return dict([(strings[code], n) for code, n in counted.items() if code])
+
+    def values(self, field):
+        """
+        Return the distinct values of ``field``.
+        """
+        return self._column(field).strings[1:]
+
+    def dumps(self):
+        """
+        Return the store encoded in the layout described in the module
+        docstring.
+        """
+        names = [field.encode("utf-8") for field in self._columns]
+        offset = _HEADER.size + _FIELD.size * len(names)
+
+        directory = [_HEADER.pack(MAGIC, self._rows, len(names))]
+        data = []
+
+        def add(chunk):
+            data.append(chunk)
+            return offset + len(chunk)
+
+        for name, column in zip(names, self._columns.values()):
+            strings = [s.encode("utf-8") for s in column.strings[1:]]
+            bounds = [0]
+            for s in strings:
+                bounds.append(bounds[-1] + len(s))
+            blob = b"".join(strings)
+            blob += b"\0" * (-len(blob) % 4)
+
+            name_offset = offset
+            offset = add(name + b"\0" * (-len(name) % 4))
+            strings_offset = offset
+            offset = add(_to_bytes(_array(bounds)) + blob)
+            codes_offset = offset
+            offset = add(_to_bytes(column.codes))
+            offsets_offset = offset
+            if column.multi:
+                offset = add(_to_bytes(column.offsets))
+
+            directory.append(_FIELD.pack(
+                name_offset, len(name), column.multi, strings_offset, len(strings),
+                codes_offset, len(column.codes), offsets_offset,
+            ))
+
+        return b"".join(directory + data)
+
+    def save(self, path):
+        with open(path, "wb") as fp:
+            fp.write(self.dumps())
+
+    @classmethod
+    def load(cls, buffer):
+        """
+        Read a store from ``buffer`` (bytes, an mmap or anything else
+        supporting the buffer protocol). Columns are decoded from it the
+        first time they are queried.
+        """
+        try:
+            view = memoryview(buffer)
+        except TypeError:
+            # Python 2's mmap doesn't support memoryview, read it instead
+            view = memoryview(buffer[:])
+        magic, rows, count = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a column store")
+
+        store = cls()
+        store._rows = rows
+        store._columns = collections.OrderedDict()
+
+        for index in range(count):
+            entry = _FIELD.unpack_from(view, _HEADER.size + _FIELD.size * index)
+            name_offset, name_length, multi, strings_offset, string_count, codes_offset, code_count, offsets_offset = entry
+            name = view[name_offset:name_offset + name_length].tobytes().decode("utf-8")
+            end = offsets_offset + 4 * (rows + 1) if multi else offsets_offset
+            store._columns[name] = _Column(bool(multi), (
+                view[:end], strings_offset, string_count, codes_offset, code_count, offsets_offset,
+            ))
+
+        # Keep the buffer alive for as long as the columns may need it
+        store._buffer = buffer
+        return store
+
+    @classmethod
+    def open(cls, path):
+        """
+        Memory map the store saved at ``path``.
+        """
+        with open(path, "rb") as fp:
+            return cls.load(mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ))
@@ -0,0 +1,160 @@
+import json
+
+from ..utils import normalize_name
+
+__all__ = ["DependencyGraph"]
+
+KINDS = ("requires", "provides", "obsoletes")
+
+
+def _predicates(dependencies, kind):
+    # Accept both the dicts produced by validators.dependencies and
+    # records produced by validators.dependencies_record
+    if isinstance(dependencies, dict):
+        return dependencies.get(kind) or ()
+    return getattr(dependencies, kind) or ()
+
+
+class DependencyGraph(object):
+    """
+    An index of the requires, provides and obsoletes edges of many
+    releases, keyed by normalized project name.
+
+    Releases are identified by a ``(normalized name, version string)``
+    tuple. Each edge keeps the predicate string it came from so callers can
+    filter on versions.
+    """
+
+    def __init__(self):
+        self._releases = {}
+        self._reverse = dict([(kind, {}) for kind in KINDS])
+        self._memo = {}
+
+    def __len__(self):
+        return len(self._releases)
+
+    def __contains__(self, release):
+        return release in self._releases
+
+    def add(self, name, version, dependencies):
+        """
+        Add (or replace) the release ``name`` ``version`` using its validated
+        ``dependencies``.
+        """
+        edges = {}
+        for kind in KINDS:
+            edges[kind] = tuple([
+                (p.key, str(p)) for p in _predicates(dependencies, kind)
+            ])
+        self._add((normalize_name(name), str(version)), edges)
+
+    def _add(self, release, edges):
+        if release in self._releases:
+            self._remove(release)
+
+        self._releases[release] = edges
+        for kind in KINDS:
+            for target, _ in edges[kind]:
+                self._reverse[kind].setdefault(target, set()).add(release)
+        self._memo.clear()
+
+    def remove(self, name, version):
+        """
+        Remove the release ``name`` ``version``.
+        """
+        release = (normalize_name(name), str(version))
+        if release not in self._releases:
+            raise KeyError(release)
+        self._remove(release)
+
+    def _remove(self, release):
+        edges = self._releases.pop(release)
+        for kind in KINDS:
+            for target, _ in edges[kind]:
+                releases = self._reverse[kind][target]
+                releases.discard(release)
+                if not releases:
+                    del self._reverse[kind][target]
+        self._memo.clear()
+
+    def edges(self, name, version, kind):
+        """
+        Return the predicate strings of one kind of edge of a release.
+        """
+        edges = self._releases[(normalize_name(name), str(version))][kind]
+        return [predicate for _, predicate in edges]
+
+    def required_by(self, name):
+        """
+        Return the set of releases that directly require ``name``.
+        """
+        return set(self._reverse["requires"].get(normalize_name(name), ()))
+
+    def provided_by(self, name):
+        """
+        Return the set of releases that provide the (possibly virtual)
+        project ``name``.
+        """
+        return set(self._reverse["provides"].get(normalize_name(name), ()))
+
+    def obsoleted_by(self, name):
+        """
+        Return the set of releases that obsolete ``name``.
+        """
+        return set(self._reverse["obsoletes"].get(normalize_name(name), ()))
+
+    def transitive_required_by(self, name):
+        """
+        Return the set of releases that require ``name`` either directly or
+        through any chain of requirements, following what each of those
+        releases provides as well as its own name.
+
+        Results are memoized until the graph is next changed.
+        """
+        key = normalize_name(name)
+        if key in self._memo:
+            return set(self._memo[key])
+
+        seen_names = set([key])
+        pending = [key]
+        found = set()
+
+        while pending:
+            target = pending.pop()
+            for release in self._reverse["requires"].get(target, ()):
+                if release in found:
+                    continue
+                found.add(release)
+
+                names = [release[0]] + [n for n, _ in self._releases[release]["provides"]]
+                for name in names:
+                    if name not in seen_names:
+                        seen_names.add(name)
+                        pending.append(name)
+
+        self._memo[key] = frozenset(found)
+        return found
+
+    def dump(self, fp):
+        """
+        Serialize the graph as JSON to the text file ``fp``.
+        """
+        json.dump({
+            "releases": [
+                [name, version, dict([(kind, [list(e) for e in edges[kind]]) for kind in KINDS])]
+                for (name, version), edges in sorted(self._releases.items())
+            ],
+        }, fp)
+
+    @classmethod
+    def load(cls, fp):
+        """
+        Load a graph written by dump(). No predicates are parsed, the
+        stored edges are used as is.
+        """
+        graph = cls()
+        for name, version, edges in json.load(fp)["releases"]:
+            graph._add((name, version), dict([
+                (kind, tuple([tuple(e) for e in edges.get(kind, ())])) for kind in KINDS
+            ]))
+        return graph
@@ -0,0 +1,92 @@
+from ..compat import string_type
+from ..utils import normalize_name
+from ..version import VersionPredicate
+
+__all__ = ["NameIndex"]
+
+
+def _key(name):
+    # VersionPredicate and records.Metadata carry their normalized name
+    key = getattr(name, "key", None)
+    return key if key is not None else normalize_name(name)
+
+
+def _version(metadata):
+    return metadata["version"] if isinstance(metadata, dict) else metadata.version
+
+
+class NameIndex(object):
+    """
+    Maps normalized project names to the metadata of their releases, so
+    that "Foo_Bar (>=1.0)", "foo.bar" and "FOO-BAR" all find the project
+    "foo-bar" with a single dict lookup.
+
+    Names can be given as strings or as anything with a ``key`` attribute
+    holding the normalized name, like VersionPredicate and records.Metadata,
+    in which case nothing is normalized again.
+    """
+
+    def __init__(self, records=()):
+        self._projects = {}
+        self._names = {}
+
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._projects)
+
+    def __contains__(self, name):
+        return _key(name) in self._projects
+
+    def add(self, metadata):
+        """
+        Add (or replace) a release from ``metadata``, a records.Metadata or a
+        dict validated by validators.metadata.
+        """
+        if isinstance(metadata, dict):
+            name, version = metadata["name"], metadata["version"]
+            key = normalize_name(name)
+        else:
+            name, version, key = metadata.name, metadata.version, metadata.key
+
+        if key not in self._projects:
+            self._projects[key] = {}
+            self._names[key] = name
+        self._projects[key][str(version)] = metadata
+
+    def remove(self, name, version):
+        """
+        Remove a release, raising KeyError if it isn't in the index.
+        """
+        key = _key(name)
+        releases = self._projects[key]
+        del releases[str(version)]
+        if not releases:
+            del self._projects[key]
+            del self._names[key]
+
+    def name(self, name):
+        """
+        Return the name ``name`` was first added under, or None.
+        """
+        return self._names.get(_key(name))
+
+    def releases(self, name):
+        """
+        Return a dict of the version strings of ``name`` to their metadata.
+        """
+        return dict(self._projects.get(_key(name), {}))
+
+    def resolve(self, predicate):
+        """
+        Return the metadata of the releases satisfying ``predicate`` (a
+        VersionPredicate or a string).
+        """
+        if isinstance(predicate, string_type):
+            predicate = VersionPredicate(predicate)
+
+        # Validated metadata holds a Version already, match that rather than
+        # parsing the version string again
+        releases = self._projects.get(predicate.key, {})
+        return [metadata for metadata in releases.values() if predicate.match(_version(metadata))]
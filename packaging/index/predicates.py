@@ -0,0 +1,191 @@
+from ..compat import string_type
+from ..version import Version, _is_release, _key
+
+__all__ = ["PredicateIndex"]
+
+# Bounds of the intervals, wrapped so that the unbounded ends compare below
+# and above every version key
+_MIN = (0,)
+_MAX = (2,)
+
+
+def _bound(key):
+    return (1, key)
+
+
+class _Entry(object):
+    """
+    A VersionPredicate compiled into a single interval of version keys, the
+    keys it excludes (``!=``) and the release prefixes it requires (bare
+    versions).
+    """
+
+    __slots__ = ("predicate", "lo", "lo_inclusive", "hi", "hi_inclusive", "excluded", "series")
+
+    def __init__(self, predicate):
+        self.predicate = predicate
+        self.lo, self.lo_inclusive = _MIN, True
+        self.hi, self.hi_inclusive = _MAX, True
+        self.excluded = set()
+        self.series = []
+
+        for operator, version in predicate.predicates:
+            bound = _bound(_key(version.parts))
+
+            if operator == "":
+                self.series.append(version.parts[0] if _is_release(version.parts) else None)
+            if operator in (">", ">=", "=="):
+                inclusive = operator != ">"
+                if bound > self.lo or (bound == self.lo and not inclusive):
+                    self.lo, self.lo_inclusive = bound, inclusive
+            if operator in ("<", "<=", "=="):
+                inclusive = operator != "<"
+                if bound < self.hi or (bound == self.hi and not inclusive):
+                    self.hi, self.hi_inclusive = bound, inclusive
+            if operator == "!=":
+                self.excluded.add(bound)
+
+    @property
+    def empty(self):
+        if None in self.series:
+            return True
+        if self.lo == self.hi:
+            return not (self.lo_inclusive and self.hi_inclusive)
+        return self.lo > self.hi
+
+    def admits(self, bound, parts):
+        if bound < self.lo or (bound == self.lo and not self.lo_inclusive):
+            return False
+        if bound > self.hi or (bound == self.hi and not self.hi_inclusive):
+            return False
+        if bound in self.excluded:
+            return False
+        for series in self.series:
+            if not _is_release(parts) or parts[0][:len(series)] != series:
+                return False
+        return True
+
+
+class _Node(object):
+    """
+    A node of a centered interval tree: it holds the intervals containing
+    ``center`` sorted by their lower and (descending) upper bounds, the
+    ones entirely below it on the left and entirely above it on the right.
+    """
+
+    __slots__ = ("center", "by_lo", "by_hi", "left", "right")
+
+    def __init__(self, entries):
+        bounds = sorted([e.lo for e in entries] + [e.hi for e in entries])
+        self.center = center = bounds[len(bounds) // 2]
+
+        here = [e for e in entries if e.lo <= center <= e.hi]
+        left = [e for e in entries if e.hi < center]
+        right = [e for e in entries if e.lo > center]
+
+        self.by_lo = sorted(here, key=lambda e: e.lo)
+        self.by_hi = sorted(here, key=lambda e: e.hi, reverse=True)
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+    def stab(self, bound, found):
+        node = self
+        while node is not None:
+            if bound < node.center:
+                for entry in node.by_lo:
+                    if entry.lo > bound:
+                        break
+                    if entry.lo < bound or entry.lo_inclusive:
+                        found.append(entry)
+                node = node.left
+            elif bound > node.center:
+                for entry in node.by_hi:
+                    if entry.hi < bound:
+                        break
+                    if entry.hi > bound or entry.hi_inclusive:
+                        found.append(entry)
+                node = node.right
+            else:
+                for entry in node.by_lo:
+                    if (entry.lo < bound or entry.lo_inclusive) and (entry.hi > bound or entry.hi_inclusive):
+                        found.append(entry)
+                node = None
+
+
+class PredicateIndex(object):
+    """
+    An index over many VersionPredicates (typically every requirement on
+    one project) answering "which of them does this version satisfy?".
+
+    Predicates with a series (bare version) constraint are bucketed by the
+    release prefix they require, everything else is compiled into an
+    interval and kept in an interval tree, so a query costs O(log n + k)
+    plus O(depth) for the series buckets instead of calling match() on
+    every predicate.
+    """
+
+    def __init__(self, predicates=()):
+        self._entries = []
+        self._series = {}
+        # Predicates no version can satisfy, only kept so they can be removed
+        self._never = []
+        self._tree = None
+        self._dirty = False
+
+        for predicate in predicates:
+            self.add(predicate)
+
+    def __len__(self):
+        return len(self._entries) + len(self._never) + sum([len(e) for e in self._series.values()])
+
+    def add(self, predicate):
+        entry = _Entry(predicate)
+        if entry.empty:
+            self._never.append(entry)
+        elif entry.series:
+            self._series.setdefault(entry.series[0], []).append(entry)
+        else:
+            self._entries.append(entry)
+            self._dirty = True
+
+    def remove(self, predicate):
+        """
+        Remove ``predicate``, which must be the same object that was added.
+        """
+        for bucket in [self._entries, self._never] + list(self._series.values()):
+            for i, entry in enumerate(bucket):
+                if entry.predicate is predicate:
+                    del bucket[i]
+                    if bucket is self._entries:
+                        self._dirty = True
+                    return
+        raise ValueError("{predicate!r} is not in the index".format(predicate=predicate))
+
+    def match(self, version):
+        """
+        Return the predicates that ``version`` satisfies, in no particular
+        order.
+        """
+        if isinstance(version, string_type):
+            version = Version(version)
+
+        parts = version.parts
+        bound = _bound(_key(parts))
+
+        if self._dirty:
+            self._tree = _Node(self._entries) if self._entries else None
+            self._dirty = False
+
+        found = []
+        if self._tree is not None:
+            self._tree.stab(bound, found)
+            found = [e for e in found if bound not in e.excluded]
+
+        if _is_release(parts):
+            release = parts[0]
+            for end in range(len(release) + 1):
+                for entry in self._series.get(release[:end], ()):
+                    if entry.admits(bound, parts):
+                        found.append(entry)
+
+        return [e.predicate for e in found]
@@ -0,0 +1,89 @@
+from ..compat import string_type
+from ..version import Version, VersionPredicate
+from .names import _key
+
+__all__ = ["PYTHON_VERSIONS", "PythonIndex"]
+
+# The interpreter versions compatibility is tracked for, one bit each
+PYTHON_VERSIONS = (
+    "2.6", "2.7",
+    "3.0", "3.1", "3.2", "3.3", "3.4", "3.5", "3.6", "3.7", "3.8", "3.9",
+    "3.10", "3.11", "3.12", "3.13",
+)
+
+
+class PythonIndex(object):
+    """
+    Records, for every release, which of a fixed set of interpreter versions
+    its ``python`` requirement admits as a bitmask, so that finding the
+    releases compatible with an interpreter is a bit test per release rather
+    than evaluating each requirement again.
+
+    Compatibility is only known at the granularity of ``pythons``: a
+    requirement of ">3.4" does not admit "3.4" even though it does admit
+    3.4.1.
+
+    Projects are looked up by normalized name, given as a string or as
+    anything with a ``key`` attribute (see NameIndex).
+    """
+
+    def __init__(self, pythons=PYTHON_VERSIONS):
+        self.pythons = tuple(pythons)
+        self._versions = [Version(p) for p in self.pythons]
+        self._bits = dict([(p, 1 << i) for i, p in enumerate(self.pythons)])
+        self._all = (1 << len(self.pythons)) - 1
+        self._projects = {}
+
+    def mask(self, requirement):
+        """
+        Return the bitmask of the interpreters admitted by ``requirement``,
+        a predicate as produced by validators.dependencies_python, a
+        requirement string such as ">=2.6,<3.0", or None for no requirement.
+        """
+        if requirement is None:
+            return self._all
+        if isinstance(requirement, string_type):
+            requirement = VersionPredicate("python (%s)" % requirement)
+
+        mask = 0
+        for i, version in enumerate(self._versions):
+            if requirement.match(version):
+                mask |= 1 << i
+        return mask
+
+    def bit(self, python):
+        try:
+            return self._bits[str(python)]
+        except KeyError:
+            raise ValueError("Untracked Python version '{python}'".format(python=python))
+
+    def add(self, name, version, requirement=None):
+        """
+        Add (or replace) release ``version`` of project ``name``.
+        """
+        self._projects.setdefault(_key(name), {})[str(version)] = self.mask(requirement)
+
+    def remove(self, name, version):
+        key = _key(name)
+        releases = self._projects[key]
+        del releases[str(version)]
+        if not releases:
+            del self._projects[key]
+
+    def is_compatible(self, name, version, python):
+        return bool(self._projects[_key(name)][str(version)] & self.bit(python))
+
+    def compatible(self, name, python):
+        """
+        Return the versions of ``name`` compatible with ``python``.
+        """
+        bit = self.bit(python)
+        releases = self._projects.get(_key(name), {})
+        return [v for v, mask in releases.items() if mask & bit]
+
+    def pythons_for(self, name, version):
+        """
+        Return the tracked interpreter versions a release is compatible with.
+        """
+        mask = self._projects[_key(name)][str(version)]
+        return [p for i, p in enumerate(self.pythons) if mask >> i & 1]
@@ -0,0 +1,240 @@
+import bisect
+import heapq
+import math
+import re
+
+from ..utils import normalize_name
+
+__all__ = ["SearchIndex"]
+
+# How much a term found in each field counts towards a release's score
+WEIGHTS = {"name": 3, "keywords": 2, "summary": 1}
+
+_token_regex = re.compile(r"[a-z0-9]+")
+
+
+def _tokenize(text):
+    """
+    Split ``text`` into lowercased alphanumeric terms.
+    """
+    return _token_regex.findall(text.lower())
+
+
+def _write_varint(out, number):
+    while number >= 0x80:
+        out.append((number & 0x7f) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def _read_varints(data):
+    number = shift = 0
+    for byte in data:
+        number |= (byte & 0x7f) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield number
+            number = shift = 0
+
+
+class _Postings(object):
+    """
+    The releases a term appears in, as varint encoded (doc id delta,
+    weight) pairs. Doc ids are handed out in increasing order so new
+    releases are always appended.
+    """
+
+    __slots__ = ("data", "last", "count")
+
+    def __init__(self):
+        self.data = bytearray()
+        self.last = 0
+        self.count = 0
+
+    def append(self, doc, weight):
+        _write_varint(self.data, doc - self.last)
+        _write_varint(self.data, weight)
+        self.last = doc
+        self.count += 1
+
+    def __iter__(self):
+        doc = 0
+        numbers = _read_varints(self.data)
+        for delta in numbers:
+            doc += delta
+            yield doc, next(numbers)
+
+
+class SearchIndex(object):
+    """
+    An inverted index of the name, keywords and summary of releases.
+
+    Releases are identified by ``(normalized name, version string)``.
+    Adding a release that is already indexed replaces it: the old document
+    is only marked as removed (a tombstone) and skipped by queries until
+    compact() rewrites the posting lists without it.
+
+    A query is a string of terms, a term ending in ``*`` matches every
+    term starting with it.
+    """
+
+    def __init__(self, records=()):
+        self._postings = {}
+        self._terms = None
+        self._docs = []
+        self._releases = {}
+        self._removed = set()
+
+        for record in records:
+            self.add(record)
+
+    def __len__(self):
+        return len(self._releases)
+
+    def __contains__(self, release):
+        return release in self._releases
+
+    def add(self, metadata):
+        """
+        Index (or re-index) a release from ``metadata``, a dict validated by
+        validators.metadata or a records.Metadata.
+        """
+        if hasattr(metadata, "as_dict"):
+            metadata = metadata.as_dict()
+
+        release = (normalize_name(metadata["name"]), str(metadata["version"]))
+        if release in self._releases:
+            self.remove(*release)
+
+        weights = {}
+        for term in _tokenize(metadata["name"]):
+            weights[term] = weights.get(term, 0) + WEIGHTS["name"]
+        for keyword in metadata.get("keywords") or ():
+            for term in _tokenize(keyword):
+                weights[term] = weights.get(term, 0) + WEIGHTS["keywords"]
+        for term in _tokenize(metadata.get("summary") or ""):
+            weights[term] = weights.get(term, 0) + WEIGHTS["summary"]
+
+        doc = len(self._docs)
+        self._docs.append(release)
+        self._releases[release] = doc
+
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = _Postings()
+                self._terms = None
+            postings.append(doc, weight)
+
+    def remove(self, name, version):
+        """
+        Remove a release, raising KeyError if it isn't indexed.
+        """
+        doc = self._releases.pop((normalize_name(name), str(version)))
+        self._removed.add(doc)
+
+    def compact(self):
+        """
+        Rewrite the posting lists without the removed releases.
+        """
+        if not self._removed:
+            return
+
+        postings = {}
+        for term, old in self._postings.items():
+            new = _Postings()
+            for doc, weight in old:
+                if doc not in self._removed:
+                    new.append(doc, weight)
+            if new.count:
+                postings[term] = new
+
+        self._postings = postings
+        self._terms = None
+        self._removed = set()
+
+    def _expand(self, term):
+        """
+        Return the posting lists ``term`` refers to.
+        """
+        if not term.endswith("*"):
+            postings = self._postings.get(term)
+            return [postings] if postings is not None else []
+
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+
+        prefix = term[:-1]
+        found = []
+        for index in range(bisect.bisect_left(self._terms, prefix), len(self._terms)):
+            if not self._terms[index].startswith(prefix):
+                break
+            found.append(self._postings[self._terms[index]])
+        return found
+
+    def _parse(self, query):
+        terms = []
+        for word in query.split():
+            prefix = word.endswith("*")
+            for term in _tokenize(word):
+                terms.append(term)
+            if prefix and terms:
+                terms[-1] += "*"
+        return terms
+
+    def _scores(self, query, operator):
+        """
+        Return ``{doc: score}`` for the live releases matching ``query``.
+        """
+        if operator not in ("and", "or"):
+            raise ValueError("Unknown operator '{operator}'".format(operator=operator))
+
+        terms = self._parse(query)
+        if not terms:
+            return {}
+
+        live = len(self._releases) or 1
+        matches = []
+        for term in terms:
+            scores = {}
+            for postings in self._expand(term):
+                idf = math.log(1.0 + float(live) / postings.count)
+                for doc, weight in postings:
+                    if doc not in self._removed:
+                        scores[doc] = scores.get(doc, 0.0) + weight * idf
+            if operator == "and" and not scores:
+                return {}
+            matches.append(scores)
+
+        if operator == "and":
+            # Start from the rarest term so the intersection stays small
+            matches.sort(key=len)
+            docs = set(matches[0])
+            for scores in matches[1:]:
+                docs.intersection_update(scores)
+            return dict([(doc, sum([scores[doc] for scores in matches])) for doc in docs])
+
+        combined = {}
+        for scores in matches:
+            for doc, score in scores.items():
+                combined[doc] = combined.get(doc, 0.0) + score
+        return combined
+
+    def search(self, query, operator="and"):
+        """
+        Return the ``(name, version)`` of the releases matching all
+        (``operator="and"``) or any (``operator="or"``) of the terms of
+        ``query``, in the order they were indexed.
+        """
+        return [self._docs[doc] for doc in sorted(self._scores(query, operator))]
+
+    def top(self, query, k=10, operator="or"):
+        """
+        Return the ``k`` best ``((name, version), score)`` matches for
+        ``query``, best first. A term scores its weight in the release
+        (see WEIGHTS) times how rare it is across the index.
+        """
+        scores = self._scores(query, operator)
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(self._docs[doc], score) for doc, score in best]
@@ -0,0 +1,238 @@
+from ..compat import string_type
+from ..version import Version, VersionPredicate, _is_release, _key
+
+__all__ = ["SeriesTrie"]
+
+
+class _Node(object):
+    """
+    The releases sharing a release prefix. ``releases`` maps the key of each
+    version whose release numbers are exactly this prefix to its Version,
+    the extrema are ``(key, Version)`` pairs covering the whole subtree.
+    """
+
+    __slots__ = ("children", "releases", "count", "min", "max", "final_max")
+
+    def __init__(self):
+        self.children = {}
+        self.releases = {}
+        self.count = 0
+        self.min = self.max = self.final_max = None
+
+    def include(self, key, version, final):
+        item = key, version
+        if self.min is None or item < self.min:
+            self.min = item
+        if self.max is None or item > self.max:
+            self.max = item
+        if final and (self.final_max is None or item > self.final_max):
+            self.final_max = item
+
+    def refresh(self):
+        self.count = len(self.releases)
+        self.min = self.max = self.final_max = None
+
+        for key, version in self.releases.items():
+            self.include(key, version, _is_final(key))
+
+        for child in self.children.values():
+            self.count += child.count
+            for item, final in ((child.min, False), (child.max, False), (child.final_max, True)):
+                if item is not None:
+                    self.include(item[0], item[1], final)
+
+
+def _is_final(key):
+    return all([x[-1] == "z" for x in key[1:]])
+
+
+def _release(series):
+    """
+    Turn ``series`` (a tuple of release numbers, a dotted string such as
+    "1" or "1.4", or a plain release Version) into a tuple of ints.
+    """
+    if isinstance(series, Version):
+        if not _is_release(series.parts):
+            raise ValueError("'{series}' is not a release series".format(series=series))
+        return series.parts[0]
+    if isinstance(series, string_type):
+        try:
+            return tuple([int(x) for x in series.split(".")]) if series else ()
+        except ValueError:
+            raise ValueError("'{series}' is not a release series".format(series=series))
+    return tuple(series)
+
+
+class SeriesTrie(object):
+    """
+    The versions of a project in a trie keyed on their release numbers, so
+    that "1.4" is the parent of "1.4.0" and "1.4.2", which in turn hold
+    their pre and post releases.
+
+    Every node caches the oldest, newest and newest final version below it,
+    which makes latest() and oldest() cost a walk down the trie instead of a
+    scan of every release, and series() is answered from the node counts.
+
+    Equal versions are a single entry, as in dedupe_versions(): adding
+    "1.4.0" when "1.4" is already there does nothing, and the entry stays
+    under the release numbers it was first added with ("1.4", so it isn't
+    in the series "1.4.0"). Either spelling finds or removes it.
+    """
+
+    def __init__(self, versions=()):
+        self._root = _Node()
+        # The release numbers each entry is stored under, by key
+        self._releases = {}
+        for version in versions:
+            self.add(version)
+
+    def __len__(self):
+        return self._root.count
+
+    def __contains__(self, version):
+        if not isinstance(version, Version):
+            version = Version(version)
+        return _key(version.parts) in self._releases
+
+    def _find(self, release):
+        node = self._root
+        for number in release:
+            node = node.children.get(number)
+            if node is None:
+                return None
+        return node
+
+    def add(self, version):
+        """
+        Add ``version`` (a Version or a version string).
+        """
+        if not isinstance(version, Version):
+            version = Version(version)
+        key = _key(version.parts)
+        if key in self._releases:
+            return
+        self._releases[key] = version.parts[0]
+
+        path = [self._root]
+        for number in version.parts[0]:
+            path.append(path[-1].children.setdefault(number, _Node()))
+        path[-1].releases[key] = version
+
+        final = _is_final(key)
+        for node in path:
+            node.count += 1
+            node.include(key, version, final)
+
+    def remove(self, version):
+        """
+        Remove ``version``, raising KeyError if it is not in the trie.
+        """
+        if not isinstance(version, Version):
+            version = Version(version)
+        key = _key(version.parts)
+        release = self._releases.pop(key, None)
+        if release is None:
+            raise KeyError(str(version))
+
+        path = [self._root]
+        for number in release:
+            path.append(path[-1].children[number])
+        del path[-1].releases[key]
+
+        # Only the nodes on the path can have changed, refresh them bottom up
+        # and drop the ones left empty
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            node.refresh()
+            if depth and not node.count:
+                del path[depth - 1].children[release[depth - 1]]
+
+    def latest(self, series=(), final=False):
+        """
+        Return the newest version in ``series`` (every version if it is
+        empty), only considering final releases if ``final`` is True, or
+        None if there is none.
+        """
+        node = self._find(_release(series))
+        if node is None:
+            return None
+        item = node.final_max if final else node.max
+        return str(item[1]) if item is not None else None
+
+    def oldest(self, series=()):
+        """
+        Return the oldest version in ``series``, or None.
+        """
+        node = self._find(_release(series))
+        return str(node.min[1]) if node is not None and node.min is not None else None
+
+    def count(self, series=()):
+        node = self._find(_release(series))
+        return node.count if node is not None else 0
+
+    def series(self, series=(), depth=1):
+        """
+        Return ``(series, count)`` for every series ``depth`` levels below
+        ``series``, e.g. ``[("1.3", 4), ("1.4", 2)]`` for ``series="1"``.
+        """
+        release = _release(series)
+        node = self._find(release)
+        if node is None:
+            return []
+
+        found = []
+        level = [(release, node)]
+        for _ in range(depth):
+            level = [(prefix + (number,), child) for prefix, node in level for number, child in node.children.items()]
+        for prefix, node in sorted(level, key=lambda item: item[0]):
+            found.append((".".join([str(n) for n in prefix]), node.count))
+        return found
+
+    def _items(self, node):
+        items = list(node.releases.items())
+        for child in node.children.values():
+            items.extend(self._items(child))
+        return items
+
+    def versions(self, series=()):
+        """
+        Return every version in ``series``, oldest first.
+        """
+        node = self._find(_release(series))
+        if node is None:
+            return []
+        return [str(version) for _, version in sorted(self._items(node))]
+
+    def match(self, predicate):
+        """
+        Return the versions satisfying ``predicate`` (a VersionPredicate or
+        a string), oldest first.
+
+        Only the subtree of the series the predicate requires, if any, is
+        looked at.
+        """
+        if isinstance(predicate, string_type):
+            predicate = VersionPredicate(predicate)
+
+        series = []
+        for operator, version in predicate.predicates:
+            if operator == "":
+                if not _is_release(version.parts):
+                    return []
+                series.append(version.parts[0])
+
+        # Every series has to be a prefix of the longest one
+        release = max(series, key=len) if series else ()
+        if any([release[:len(s)] != s for s in series]):
+            return []
+
+        node = self._find(release)
+        if node is None:
+            return []
+
+        # The stored Versions are matched as is, nothing is parsed again
+        matches = []
+        for key, version in sorted(self._items(node)):
+            if predicate.match(version):
+                matches.append(str(version))
+        return matches
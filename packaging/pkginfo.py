@@ -0,0 +1,231 @@
+import fnmatch
+import io
+import mmap
+import os
+import re
+
+from .compat import text_type
+
+__all__ = ["parse", "parse_distribution", "parse_string", "parse_file", "iter_directory"]
+
+# Files larger than this are mapped into memory rather than read through a
+# buffered file object
+MMAP_THRESHOLD = 64 * 1024
+
+# Headers that map directly to a single key of validators.metadata
+_SINGLE = {
+    "name": "name",
+    "version": "version",
+    "summary": "summary",
+    "description": "description",
+    "author": "author",
+    "author-email": "author-email",
+    "maintainer": "maintainer",
+    "maintainer-email": "maintainer-email",
+    "license": "license",
+}
+
+# Headers that may be repeated and are collected into a list
+_MULTIPLE = {
+    "classifier": "classifiers",
+    "platform": "platforms",
+    "supported-platform": "supported-platforms",
+}
+
+# Headers that become an entry of ``uris``
+_URIS = {
+    "home-page": "Home page",
+    "download-url": "Download",
+}
+
+# Headers that become a list in validators.dependencies
+_DEPENDENCIES = {
+    "provides-extra": "extras",
+    "requires": "requires",
+    "requires-dist": "requires",
+    "provides": "provides",
+    "provides-dist": "provides",
+    "obsoletes": "obsoletes",
+    "obsoletes-dist": "obsoletes",
+    "requires-external": "externals",
+}
+
+# Value setuptools writes for fields that were not given
+_UNKNOWN = "UNKNOWN"
+
+
+def _continuation(line):
+    # setuptools indents continuation lines by 8 spaces, older versions
+    # used 7 spaces and a "|"
+    if line[:8] == b"        " or line[:8] == b"       |":
+        return line[8:]
+    return line.lstrip()
+
+
+def _headers(fp):
+    """
+    Read RFC 822 style headers from a binary file-like object, yielding
+    ``(lowercased name, value)`` pairs followed by ``("description", body)``
+    if the headers are followed by a body.
+    """
+    name, value = None, None
+
+    for line in iter(fp.readline, b""):
+        line = line.rstrip(b"\r\n")
+
+        if line[:1] in (b" ", b"\t"):
+            if name is not None:
+                value.append(_continuation(line))
+            continue
+
+        if name is not None:
+            yield name, b"\n".join(value)
+            name, value = None, None
+
+        if not line.strip():
+            # End of the headers, anything that follows is the description
+            body = fp.read()
+            if body.strip():
+                yield "description", body
+            return
+
+        key, sep, first = line.partition(b":")
+        if sep:
+            name, value = key.strip().decode("ascii").lower(), [first.strip()]
+
+    if name is not None:
+        yield name, b"\n".join(value)
+
+
+_extra_marker_regex = re.compile(r"\bextra\b")
+
+
+def _requirement(value):
+    """
+    Turn a Requires-Dist style requirement into the "name (versions)" form
+    VersionPredicate understands, dropping any extras and environment
+    marker. Returns None for the requirements of an optional extra, as
+    they aren't dependencies of the distribution itself.
+    """
+    value, _, marker = value.partition(";")
+    if _extra_marker_regex.search(marker):
+        return None
+    value = value.strip()
+
+    name, bracket, rest = value.partition("[")
+    if bracket:
+        value = name + rest.partition("]")[2]
+
+    if "(" not in value:
+        for i, char in enumerate(value):
+            if char in "<>=!~":
+                return "%s (%s)" % (value[:i].strip(), value[i:].strip())
+    return value
+
+
+def _parse(fp):
+    data, dependencies = {}, {}
+
+    for name, value in _headers(fp):
+        value = value.decode("utf-8")
+
+        if value.strip() == _UNKNOWN:
+            continue
+
+        if name in _SINGLE:
+            data[_SINGLE[name]] = value
+        elif name in _MULTIPLE:
+            data.setdefault(_MULTIPLE[name], []).append(value)
+        elif name in _URIS:
+            data.setdefault("uris", {})[_URIS[name]] = value
+        elif name == "project-url":
+            label, _, url = value.partition(",")
+            data.setdefault("uris", {})[label.strip()] = url.strip()
+        elif name == "keywords":
+            separator = "," if "," in value else None
+            data["keywords"] = [k.strip() for k in value.split(separator) if k.strip()]
+        elif name == "requires-python":
+            dependencies["python"] = value
+        elif name in _DEPENDENCIES:
+            if _DEPENDENCIES[name] in ("requires", "provides", "obsoletes"):
+                value = _requirement(value)
+                if value is None:
+                    continue
+            dependencies.setdefault(_DEPENDENCIES[name], []).append(value)
+
+    return data, dependencies
+
+
+def parse(fp):
+    """
+    Parse a PKG-INFO or METADATA file from a binary file-like object (or an
+    mmap) into the dict expected by validators.metadata.
+    """
+    return _parse(fp)[0]
+
+
+def parse_distribution(fp):
+    """
+    Like parse(), but returns the dict expected by validators.distribution.
+    A distribution that doesn't list what it provides is taken to provide
+    itself.
+    """
+    data, dependencies = _parse(fp)
+
+    if "provides" not in dependencies and "name" in data:
+        if "version" in data:
+            dependencies["provides"] = ["%s (%s)" % (data["name"], data["version"])]
+        else:
+            dependencies["provides"] = [data["name"]]
+
+    return {"metadata": data, "dependencies": dependencies}
+
+
+def parse_string(data):
+    """
+    Parse the contents of a PKG-INFO or METADATA file given as a string.
+    """
+    if isinstance(data, text_type):
+        data = data.encode("utf-8")
+    return parse(io.BytesIO(data))
+
+
+def parse_file(path):
+    """
+    Parse the PKG-INFO or METADATA file at ``path``.
+    """
+    with open(path, "rb") as fp:
+        size = os.fstat(fp.fileno()).st_size
+        if size < MMAP_THRESHOLD or not size:
+            return parse(fp)
+
+        mapped = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return parse(mapped)
+        finally:
+            mapped.close()
+
+
+def iter_directory(path, patterns=("PKG-INFO", "METADATA"), validator=None):
+    """
+    Walk ``path`` parsing every file whose name matches one of
+    ``patterns``, yielding ``(filename, ok, result)`` for each.
+
+    ``result`` is the parsed dict, run through ``validator`` if one is
+    given, or the exception raised while parsing or validating it.
+    """
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for filename in sorted(files):
+            if not any([fnmatch.fnmatch(filename, p) for p in patterns]):
+                continue
+
+            filename = os.path.join(root, filename)
+            try:
+                result = parse_file(filename)
+                if validator is not None:
+                    result = validator.validate(result)
+            except Exception as exc:
+                yield filename, False, exc
+            else:
+                yield filename, True, result
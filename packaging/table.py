@@ -0,0 +1,320 @@
+"""
+A read-only table of the releases of many projects, encoded in a single
+flat buffer.
+
+The table is built once (e.g. in the parent of a pre-forking server) and
+then queried in place from any buffer holding it: bytes, an mmap or a
+``multiprocessing.shared_memory`` block. Queries read the encoded version
+keys straight out of the buffer, no Version objects are created and nothing
+is copied per worker.
+
+Layout (all integers are unsigned 32 bit big endian):
+
+    header      "PVT3", number of projects
+    projects    (key offset, key length, name offset, name length, entries
+                offset, entry count) per project, sorted by key (the
+                normalized name)
+    entries     (key offset, key length, version offset, version length,
+                flags) per release, sorted by version within a project
+    data        keys, names, encoded version keys (see version._encode_key)
+                and version strings
+
+The flags of a release are FINAL and RELEASE (a plain release such as
+"1.4.2") in the low byte, and how many release numbers the version has
+shifted left by 8, which the encoded key drops when they are zeros.
+"""
+import binascii
+import mmap
+import struct
+
+from .compat import string_type
+from .utils import normalize_name
+from .version import VersionPredicate, _encode_key, _is_release, _key, _parts
+
+__all__ = ["build_table", "share_mmap", "share_memory", "VersionTable"]
+
+MAGIC = b"PVT3"
+
+FINAL = 1
+RELEASE = 2
+
+_HEADER = struct.Struct(">4sI")
+_PROJECT = struct.Struct(">IIIIII")
+_ENTRY = struct.Struct(">IIIII")
+
+
+def _flags(parts):
+    flags = len(parts[0]) << 8
+    if all([x[-1] == "z" for x in parts[1:]]):
+        flags |= FINAL
+    if _is_release(parts):
+        flags |= RELEASE
+    return flags
+
+
+def build_table(releases, skip_invalid=False, fuzzy=False):
+    """
+    Encode ``releases``, a mapping of project name to an iterable of version
+    strings, into the bytes of a table. Names that normalize to the same
+    key are merged under the first of them in sorted order. See _parts()
+    for ``skip_invalid`` and ``fuzzy``.
+    """
+    projects = {}
+    for name in sorted(releases):
+        key = normalize_name(name)
+        if key not in projects:
+            projects[key] = (name, [])
+        for version in releases[name]:
+            parts = _parts(version, skip_invalid, fuzzy)
+            if parts is not None:
+                projects[key][1].append((_encode_key(_key(parts)), version, _flags(parts)))
+
+    entries_start = _HEADER.size + _PROJECT.size * len(projects)
+    data_start = entries_start + _ENTRY.size * sum([len(v) for _, v in projects.values()])
+
+    header = [_HEADER.pack(MAGIC, len(projects))]
+    entries = []
+    data = []
+    offset = data_start
+
+    for key in sorted(projects, key=lambda k: k.encode("utf-8")):
+        name, versions = projects[key]
+        key, name = key.encode("utf-8"), name.encode("utf-8")
+        header.append(_PROJECT.pack(
+            offset, len(key), offset + len(key), len(name),
+            entries_start + _ENTRY.size * len(entries), len(versions),
+        ))
+        data.extend([key, name])
+        offset += len(key) + len(name)
+
+        for encoded, version, flags in sorted(versions, key=lambda e: e[0]):
+            version = version.encode("utf-8")
+            entries.append(_ENTRY.pack(offset, len(encoded), offset + len(encoded), len(version), flags))
+            data.extend([encoded, version])
+            offset += len(encoded) + len(version)
+
+    return b"".join(header + entries + data)
+
+
+def _release_numbers(encoded, flags):
+    """
+    Return the release numbers of a plain release from its encoded key and
+    flags, adding back the trailing zeros the key dropped.
+    """
+    numbers = []
+    index = 0
+    while encoded[index:index + 1] != b"\x00":
+        # Release numbers are all integers: \x02, a length byte and the
+        # big endian bytes
+        size = bytearray(encoded[index + 1:index + 2])[0]
+        numbers.append(int(binascii.hexlify(encoded[index + 2:index + 2 + size]) or b"0", 16))
+        index += 2 + size
+    return tuple(numbers) + (0,) * ((flags >> 8) - len(numbers))
+
+
+def share_mmap(data):
+    """
+    Copy a table into an anonymous shared mmap. Processes forked after this
+    all read the same pages.
+    """
+    mapped = mmap.mmap(-1, len(data))
+    mapped.write(data)
+    mapped.seek(0)
+    return mapped
+
+
+def share_memory(data, name=None):
+    """
+    Copy a table into a new ``multiprocessing.shared_memory`` block (Python
+    3.8+), which other processes can open by name with VersionTable.attach().
+    The caller owns the block and must close() and unlink() it.
+    """
+    from multiprocessing import shared_memory
+
+    block = shared_memory.SharedMemory(name=name, create=True, size=len(data))
+    block.buf[:len(data)] = data
+    return block
+
+
+class VersionTable(object):
+    """
+    Queries a table built by build_table() directly from ``buffer``, which
+    can be any object supporting the buffer protocol.
+
+    close() releases the buffer (and closes the block of an attached
+    table); tables can also be used as context managers.
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._block = None
+
+        magic, self._count = _HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a version table")
+
+    @classmethod
+    def attach(cls, name):
+        """
+        Open a table published with share_memory() by another process.
+        """
+        from multiprocessing import shared_memory
+
+        block = shared_memory.SharedMemory(name=name)
+        table = cls(block.buf)
+        # Keep the block open for as long as the table is used
+        table._block = block
+        return table
+
+    def close(self):
+        """
+        Release the buffer. Closing an attached table detaches it from the
+        shared memory block, which its owner still has to unlink().
+        """
+        if hasattr(self._view, "release"):
+            self._view.release()
+        self._buffer = None
+        if self._block is not None:
+            self._block.close()
+            self._block = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, name):
+        return self._find(name) is not None
+
+    def _bytes(self, offset, length):
+        return self._view[offset:offset + length].tobytes()
+
+    def _project(self, index):
+        return _PROJECT.unpack_from(self._view, _HEADER.size + _PROJECT.size * index)
+
+    def _find(self, name):
+        # VersionPredicate carries its normalized name
+        key = getattr(name, "key", None)
+        if key is None:
+            key = normalize_name(name)
+        key = key.encode("utf-8")
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_start, key_length, _, _, start, count = self._project(mid)
+            found = self._bytes(key_start, key_length)
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                return start, count
+        return None
+
+    def _entry(self, start, index):
+        return _ENTRY.unpack_from(self._view, start + _ENTRY.size * index)
+
+    def _version(self, entry):
+        return self._bytes(entry[2], entry[3]).decode("utf-8")
+
+    def _entries(self, name):
+        found = self._find(name)
+        if found is None:
+            raise KeyError(name)
+        return found
+
+    def projects(self):
+        """
+        Return the names of every project in the table, in the order of
+        their normalized names.
+        """
+        names = []
+        for index in range(self._count):
+            _, _, name_start, name_length, _, _ = self._project(index)
+            names.append(self._bytes(name_start, name_length).decode("utf-8"))
+        return names
+
+    def versions(self, name):
+        """
+        Return the versions of ``name``, oldest first.
+        """
+        start, count = self._entries(name)
+        return [self._version(self._entry(start, i)) for i in range(count)]
+
+    def latest(self, name, final=False):
+        """
+        Return the newest version of ``name`` (only considering final
+        releases if ``final`` is True), or None.
+        """
+        start, count = self._entries(name)
+        for index in range(count - 1, -1, -1):
+            entry = self._entry(start, index)
+            if not final or entry[4] & FINAL:
+                return self._version(entry)
+        return None
+
+    def _bisect(self, start, count, key, right):
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = self._entry(start, mid)
+            found = self._bytes(entry[0], entry[1])
+            if found < key or (right and found == key):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def match(self, predicate):
+        """
+        Return the versions of the project named by ``predicate`` (a
+        VersionPredicate or a string) that satisfy it, oldest first.
+
+        The range allowed by the ordered comparisons is found by binary
+        search over the encoded keys, only ``!=`` and series constraints are
+        checked release by release.
+        """
+        if isinstance(predicate, string_type):
+            predicate = VersionPredicate(predicate)
+
+        found = self._find(predicate)
+        if found is None:
+            return []
+        start, count = found
+
+        lo, hi = 0, count
+        excluded = set()
+        series = []
+
+        for operator, version in predicate.predicates:
+            key = _encode_key(_key(version.parts))
+            if operator in (">", ">=", "=="):
+                lo = max(lo, self._bisect(start, count, key, operator == ">"))
+            if operator in ("<", "<=", "=="):
+                hi = min(hi, self._bisect(start, count, key, operator != "<"))
+            if operator == "!=":
+                excluded.add(key)
+            if operator == "":
+                if not _is_release(version.parts):
+                    return []
+                series.append(version.parts[0])
+
+        versions = []
+        for index in range(lo, hi):
+            entry = self._entry(start, index)
+            if excluded and self._bytes(entry[0], entry[1]) in excluded:
+                continue
+            if series:
+                if not entry[4] & RELEASE:
+                    continue
+                release = _release_numbers(self._bytes(entry[0], entry[1]), entry[4])
+                if any([release[:len(s)] != s for s in series]):
+                    continue
+            versions.append(self._version(entry))
+        return versions
@@ -0,0 +1,12 @@
+import re
+
+__all__ = ["normalize_name"]
+
+
+def normalize_name(name):
+    """
+    Return the canonical form of a project name: lowercased, with every run
+    of "-", "_", "." and whitespace replaced by a single "-", so that
+    "Foo_Bar", "foo.bar" and "FOO - bar" all become "foo-bar".
+    """
+    return re.sub(r"[-_.\s]+", "-", name).lower()
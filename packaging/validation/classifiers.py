@@ -0,0 +1,106 @@
+import bisect
+import pkgutil
+
+__all__ = ["Classifiers", "index", "is_classifier"]
+
+
+class Classifiers(object):
+    """
+    An index over the known trove classifiers.
+
+    The list is only read (from the bundled ``classifiers.txt`` unless one is
+    given explicitly) the first time the index is used. Every classifier is
+    assigned an integer id, its position in the list, so that the
+    classifiers of a record can be encoded as a bitmask and compared across
+    records with plain integer set operations. For those masks to stay
+    valid the list is append-only: new classifiers go at the end, and
+    deprecated ones keep their place.
+    """
+
+    def __init__(self, classifiers=None):
+        self._source = classifiers
+        self._classifiers = None
+        self._sorted = None
+        self._ids = None
+
+    def _load(self):
+        if self._sorted is None:
+            classifiers = self._source
+            if classifiers is None:
+                data = pkgutil.get_data(__name__.rsplit(".", 1)[0], "classifiers.txt")
+                classifiers = [c for c in data.decode("utf-8").splitlines() if not c.startswith("#")]
+
+            ids = {}
+            for classifier in classifiers:
+                classifier = classifier.strip()
+                if classifier and classifier not in ids:
+                    ids[classifier] = len(ids)
+
+            self._ids = ids
+            self._classifiers = tuple(sorted(ids, key=ids.get))
+            self._sorted = tuple(sorted(ids))
+
+        return self._sorted
+
+    def __len__(self):
+        return len(self._load())
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __contains__(self, classifier):
+        self._load()
+        return classifier in self._ids
+
+    def startswith(self, prefix):
+        """
+        Return every known classifier that starts with ``prefix``, in sorted
+        order.
+        """
+        classifiers = self._load()
+        start = bisect.bisect_left(classifiers, prefix)
+        end = start
+        while end < len(classifiers) and classifiers[end].startswith(prefix):
+            end += 1
+        return list(classifiers[start:end])
+
+    def id(self, classifier):
+        """
+        Return the integer id of ``classifier``.
+        """
+        self._load()
+        try:
+            return self._ids[classifier]
+        except KeyError:
+            raise ValueError("Unknown classifier '{classifier}'".format(classifier=classifier))
+
+    def encode(self, classifiers):
+        """
+        Encode an iterable of classifiers as a bitmask of their ids.
+        """
+        mask = 0
+        for classifier in classifiers:
+            mask |= 1 << self.id(classifier)
+        return mask
+
+    def decode(self, mask):
+        """
+        Return the sorted list of classifiers contained in ``mask``.
+        """
+        self._load()
+        return sorted([c for i, c in enumerate(self._classifiers) if mask >> i & 1])
+
+    def prefix_mask(self, prefix):
+        """
+        Return a bitmask of every classifier that starts with ``prefix``, so
+        that ``record_mask & prefix_mask`` tests a record against the whole
+        group at once.
+        """
+        return self.encode(self.startswith(prefix))
+
+
+index = Classifiers()
+
+
+def is_classifier(value):
+    return value in index
@@ -0,0 +1,260 @@
+"""
+Storage for the distribution documents of many releases where each project
+keeps its first release in full and every later release as the fields that
+differ from it, as successive releases rarely change more than the version
+and a requirement or two.
+
+Documents are the JSON-like dicts validators.distribution accepts. The first
+release of a project is validated in full; later ones only have their
+changed fields validated, each with the schema of that field.
+"""
+import collections
+import copy
+import json
+
+from . import validators
+from .schema import Optional, SchemaError
+from ..utils import normalize_name
+
+__all__ = ["DeltaStore"]
+
+SECTIONS = ("metadata", "dependencies")
+
+
+def _fields(schema):
+    """
+    Return ``({field: schema}, required fields)`` of a dict Schema.
+    """
+    fields = {}
+    required = set()
+    for key, value in schema._schema.items():
+        if type(key) is Optional:
+            fields[key._schema] = value
+        else:
+            fields[key] = value
+            required.add(key)
+    return fields, required
+
+
+_SCHEMAS = {
+    "metadata": _fields(validators.metadata),
+    "dependencies": _fields(validators.dependencies),
+}
+
+
+def _release(document):
+    metadata = document["metadata"]
+    return normalize_name(metadata["name"]), metadata["version"]
+
+
+def _diff(base, document):
+    """
+    Return the delta turning ``base`` into ``document``: for each section
+    with changes, the fields whose value changed and the fields removed.
+    """
+    delta = {}
+    for section in SECTIONS:
+        old, new = base[section], document[section]
+        changed = dict([(k, v) for k, v in new.items() if k not in old or old[k] != v])
+        removed = sorted([k for k in old if k not in new])
+        if changed or removed:
+            delta[section] = [changed, removed]
+    return delta
+
+
+def _apply(base, delta):
+    document = {}
+    for section in SECTIONS:
+        values = dict(base[section])
+        if section in delta:
+            changed, removed = delta[section]
+            values.update(changed)
+            for key in removed:
+                del values[key]
+        document[section] = values
+    return copy.deepcopy(document)
+
+
+def _check_structure(delta):
+    """
+    Raise SchemaError if ``delta`` adds unknown fields or removes required
+    ones, and return the changed ``(section, field, value)`` that still
+    have to be validated.
+    """
+    pending = []
+    for section, (changed, removed) in delta.items():
+        fields, required = _SCHEMAS[section]
+        for key in removed:
+            if key in required:
+                raise SchemaError("key %r is required" % key, None)
+        for key, value in changed.items():
+            if key not in fields:
+                raise SchemaError("wrong key %r in %r" % (key, section), None)
+            pending.append((section, key, value))
+    return pending
+
+
+class _Project(object):
+
+    __slots__ = ("base", "releases")
+
+    def __init__(self, base):
+        self.base = base
+        # Version string to delta, in the order they were added
+        self.releases = collections.OrderedDict()
+
+
+class DeltaStore(object):
+    """
+    Keeps the first document added for each project as its base and every
+    release as a delta against it (the first release's being empty; it only
+    changes if that release is replaced). Projects are keyed by normalized
+    name.
+    """
+
+    def __init__(self):
+        self._projects = {}
+
+    def __len__(self):
+        return sum([len(p.releases) for p in self._projects.values()])
+
+    def __contains__(self, release):
+        name, version = release
+        project = self._projects.get(normalize_name(name))
+        return project is not None and version in project.releases
+
+    def projects(self):
+        return sorted(self._projects)
+
+    def versions(self, name):
+        """
+        Return the version strings of ``name``, in the order they were
+        added.
+        """
+        return list(self._projects[normalize_name(name)].releases)
+
+    def get(self, name, version):
+        """
+        Rebuild the document of a release, raising KeyError if it isn't
+        stored.
+        """
+        project = self._projects[normalize_name(name)]
+        return _apply(project.base, project.releases[version])
+
+    def add(self, document):
+        """
+        Validate and store the document of a release, replacing any stored
+        document for the same release. Raises SchemaError if it is invalid.
+        """
+        error = self.extend([document])[0]
+        if error is not None:
+            raise error
+
+    def extend(self, documents):
+        """
+        Validate and store many documents, returning for each the
+        SchemaError it failed with or None. Invalid documents are not
+        stored.
+
+        Changed fields are validated in a batch per field, and a value
+        shared by several releases (a new requirement, say) is validated
+        only once.
+        """
+        errors = [None] * len(documents)
+        pending = []
+        checks = collections.defaultdict(list)
+
+        for index, document in enumerate(documents):
+            try:
+                name, version = _release(document)
+            except (KeyError, TypeError) as exc:
+                errors[index] = SchemaError("invalid distribution %r: %r" % (document, exc), None)
+                continue
+
+            project = self._projects.get(name)
+            if project is None:
+                # First release of the project: validate everything and
+                # make it the base
+                try:
+                    validators.distribution.validate(document)
+                except SchemaError as exc:
+                    errors[index] = exc
+                    continue
+                project = self._projects[name] = _Project(copy.deepcopy(document))
+                project.releases[version] = {}
+                continue
+
+            try:
+                if set(document) != set(SECTIONS) or not all([isinstance(document[s], dict) for s in SECTIONS]):
+                    raise SchemaError("missed or wrong keys in %r" % (document,), None)
+                delta = _diff(project.base, document)
+                fields = _check_structure(delta)
+            except SchemaError as exc:
+                errors[index] = exc
+                continue
+
+            for section, key, value in fields:
+                checks[(section, key)].append((index, value))
+            pending.append((index, name, version, delta))
+
+        for (section, key), values in checks.items():
+            schema = _SCHEMAS[section][0][key]
+            seen = {}
+            for index, value in values:
+                if errors[index] is not None:
+                    continue
+                canonical = json.dumps(value, sort_keys=True)
+                if canonical not in seen:
+                    try:
+                        schema.validate(value)
+                    except SchemaError as exc:
+                        seen[canonical] = exc
+                    else:
+                        seen[canonical] = None
+                errors[index] = seen[canonical]
+
+        for index, name, version, delta in pending:
+            if errors[index] is None:
+                self._projects[name].releases[version] = copy.deepcopy(delta)
+
+        return errors
+
+    def remove(self, name, version):
+        """
+        Remove a release, raising KeyError if it isn't stored. The base of
+        the project is kept for the other releases to refer to.
+        """
+        key = normalize_name(name)
+        project = self._projects[key]
+        del project.releases[version]
+
+        if not project.releases:
+            del self._projects[key]
+
+    def dump(self, fp):
+        """
+        Write the store to the text file ``fp``, one JSON line per project.
+        """
+        for name in sorted(self._projects):
+            project = self._projects[name]
+            fp.write(json.dumps({
+                "base": project.base,
+                "releases": [[v, d] for v, d in project.releases.items()],
+            }, sort_keys=True, separators=(",", ":")))
+            fp.write("\n")
+
+    @classmethod
+    def load(cls, fp):
+        """
+        Read a store written by dump(). Nothing is validated again.
+        """
+        store = cls()
+        for line in fp:
+            if not line.strip():
+                continue
+            data = json.loads(line)
+            project = _Project(data["base"])
+            for version, delta in data["releases"]:
+                project.releases[version] = delta
+            store._projects[_release(project.base)[0]] = project
+        return store
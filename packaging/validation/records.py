@@ -0,0 +1,166 @@
+from . import classifiers
+from ..compat import intern, string_type
+from ..utils import normalize_name
+
+__all__ = ["Metadata", "Dependencies", "Distribution"]
+
+
+def _intern(value):
+    # Python 2 can only intern byte strings, anything else is kept as is
+    try:
+        return intern(value)
+    except TypeError:
+        return value
+
+
+def _equal(a, b):
+    # Missing fields are None, which VersionPredicate (e.g. ``python``)
+    # refuses to be compared with
+    if a is None or b is None:
+        return a is b
+    return a == b
+
+
+class Record(object):
+    """
+    A compact, slotted replacement for the dicts produced by the schemas.
+
+    Each subclass lists its attributes in ``_fields`` and the keys they come
+    from in ``_keys``, in the same (hyphenated) form the schema uses; the
+    attribute name has the hyphens replaced by underscores. Any other slots
+    hold values derived from the fields in _derive(). Missing optional keys are stored as
+    ``None``. Keys listed in ``_interned`` hold strings (or lists of strings)
+    that are highly repetitive across an index and are interned so every
+    record shares a single copy of them.
+    """
+
+    __slots__ = ()
+
+    _fields = ()
+    _keys = ()
+    _interned = ()
+
+    def __init__(self, **kwargs):
+        for attr in self._fields:
+            setattr(self, attr, kwargs.pop(attr, None))
+
+        if kwargs:
+            raise TypeError("Unexpected fields {fields!r}".format(fields=sorted(kwargs)))
+
+        self._derive()
+
+    def _derive(self):
+        pass
+
+    def __repr__(self):
+        return "%s(%s)" % (
+            self.__class__.__name__,
+            ", ".join(["%s=%r" % (a, getattr(self, a)) for a in self._fields if getattr(self, a) is not None]),
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return NotImplemented
+        return all([_equal(getattr(self, a), getattr(other, a)) for a in self._fields])
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return tuple([getattr(self, a) for a in self._fields])
+
+    def __setstate__(self, state):
+        for attr, value in zip(self._fields, state):
+            setattr(self, attr, value)
+        self._derive()
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a record from a dict that has already been validated.
+        """
+        kwargs = {}
+        for key, value in data.items():
+            if key in cls._interned:
+                if isinstance(value, string_type):
+                    value = _intern(value)
+                else:
+                    value = tuple([_intern(v) for v in value])
+            elif isinstance(value, list):
+                value = tuple(value)
+            kwargs[key.replace("-", "_")] = value
+        return cls(**kwargs)
+
+    def as_dict(self):
+        """
+        Return the record in the dict form the schemas produce.
+        """
+        data = {}
+        for key, attr in zip(self._keys, self._fields):
+            value = getattr(self, attr)
+            if value is not None:
+                data[key] = list(value) if isinstance(value, tuple) else value
+        return data
+
+
+class Metadata(Record):
+
+    _fields = (
+        "name", "version", "summary", "description", "license", "keywords",
+        "author", "author_email", "maintainer", "maintainer_email",
+        "classifiers", "uris", "platforms", "supported_platforms",
+    )
+
+    # ``key`` is the normalized name, for looking the project up in indexes,
+    # ``_classifier_mask`` caches classifier_mask
+    __slots__ = _fields + ("key", "_classifier_mask")
+
+    _keys = tuple([a.replace("_", "-") for a in _fields])
+    _interned = ("license", "author", "maintainer", "classifiers", "platforms", "supported-platforms")
+
+    def _derive(self):
+        self.key = normalize_name(self.name) if self.name is not None else None
+        self._classifier_mask = None
+
+    @property
+    def classifier_mask(self):
+        """
+        The classifiers as a bitmask of their ids in classifiers.index (see
+        Classifiers.encode()), computed the first time it is used.
+        """
+        if self._classifier_mask is None:
+            self._classifier_mask = classifiers.index.encode(self.classifiers or ())
+        return self._classifier_mask
+
+
+class Dependencies(Record):
+
+    __slots__ = _fields = (
+        "python", "extras", "setup_requires", "requires", "provides",
+        "obsoletes", "externals",
+    )
+
+    _keys = tuple([a.replace("_", "-") for a in _fields])
+    _interned = ("extras", "externals")
+
+
+class Distribution(Record):
+
+    __slots__ = _fields = ("metadata", "dependencies")
+
+    _keys = _fields
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            metadata=Metadata.from_dict(data["metadata"]),
+            dependencies=Dependencies.from_dict(data["dependencies"]),
+        )
+
+    def as_dict(self):
+        return {
+            "metadata": self.metadata.as_dict(),
+            "dependencies": self.dependencies.as_dict(),
+        }
@@ -18,9 +18,10 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-from inspect import getargspec
 from functools import wraps
 
+from ..compat import string_type
+
 
 class SchemaError(Exception):
 
@@ -92,11 +93,91 @@ class Use(object):
             raise SchemaError('%s(%r) raised %r' % (f, data, x), self._error)
 
 
+# What _cached functions found out about schema nodes, keyed by id(). The
+# node is kept along with the result so its id can't be reused. Schemas are
+# normally built once, the cache is only cleared if it grows past
+# _CACHE_SIZE nonetheless.
+_cache = {}
+_CACHE_SIZE = 4096
+
+
+def _cached(f):
+    @wraps(f)
+    def cached(s):
+        key = (f, id(s))
+        try:
+            return _cache[key][1]
+        except KeyError:
+            pass
+        if len(_cache) >= _CACHE_SIZE:
+            _cache.clear()
+        result = f(s)
+        _cache[key] = (s, result)
+        return result
+    return cached
+
+
+@_cached
+def _transforms(s):
+    """Return True if validating against ``s`` may return anything other
+    than the data it was given."""
+    if type(s) is Use:
+        return True
+    if type(s) in (And, Or):
+        return any(_transforms(a) for a in s._args)
+    if type(s) in (Schema, Optional):
+        return _transforms(s._schema)
+    if type(s) in (list, tuple, set, frozenset):
+        return any(_transforms(i) for i in s)
+    if type(s) is dict:
+        return any(_transforms(k) or _transforms(v) for k, v in s.items())
+    # Anything else with a validate method may do whatever it likes
+    return hasattr(s, 'validate')
+
+
+@_cached
+def _literal_keys(s):
+    """Return ``{key: schema key}`` if every key of the dict schema ``s`` is
+    a string (or an Optional string), so that a key of the data can only
+    ever match one of them, or None."""
+    keys = {}
+    for skey in s:
+        literal = skey._schema if type(skey) is Optional else skey
+        if not isinstance(literal, string_type) or literal in keys:
+            return None
+        keys[literal] = skey
+    return keys
+
+
+def _first(options, data, s, e, structural=False):
+    for option in options:
+        try:
+            return option.validate(data)
+        except SchemaError:
+            pass
+    if structural:
+        # Or would run the full checks to build its error
+        raise SchemaError('%r did not validate %r' % (Or(*s), data), e)
+    # None matched, let Or build the error
+    return Or(*s, error=e).validate(data)
+
+
 class Schema(object):
 
-    def __init__(self, schema, error=None):
+    """With ``copy=False`` parts of the schema that contain no Use are
+    validated in place: the original containers are returned instead of
+    rebuilt copies, and only the parts that transform are rebuilt.
+
+    With ``structural=True`` only the structure is checked: types, literal
+    values, required keys and Optional coverage. Use, predicate callables
+    and other objects with a validate method are not run, and the data is
+    always returned as is."""
+
+    def __init__(self, schema, error=None, copy=True, structural=False):
         self._schema = schema
         self._error = error
+        self._copy = copy
+        self._structural = structural
 
     def __repr__(self):
         return '%s(%r)' % (self.__class__.__name__, self._schema)
@@ -104,22 +185,53 @@ class Schema(object):
     def validate(self, data):
         s = self._schema
         e = self._error
+        structural = self._structural
         if type(s) in (list, tuple, set, frozenset):
             data = Schema(type(s), error=e).validate(data)
-            return type(s)(Or(*s, error=e).validate(d) for d in data)
+            if self._copy and not structural:
+                return type(s)(Or(*s, error=e).validate(d) for d in data)
+            options = [Schema(o, error=e, copy=False, structural=structural)
+                       for o in s]
+            if structural or not _transforms(s):
+                for d in data:
+                    _first(options, d, s, e, structural)
+                return data
+            return type(s)(_first(options, d, s, e) for d in data)
         if type(s) is dict:
             data = Schema(dict, error=e).validate(data)
-            new = type(data)()
+            inplace = structural or (not self._copy and not _transforms(s))
+            new = None if inplace else type(data)()
+            matched = 0
             err = None
             coverage = set()  # non-optional schema keys that were matched
+            literals = _literal_keys(s)
             for key, value in data.items():
                 valid = False
                 skey = None
+                if literals is not None and key in literals:
+                    # Only this schema key can match, failures go through
+                    # the loop below to get the same error
+                    try:
+                        nvalue = Schema(s[literals[key]], error=e,
+                                        copy=self._copy, structural=structural
+                                        ).validate(value)
+                    except SchemaError:
+                        pass
+                    else:
+                        coverage.add(literals[key])
+                        if new is not None:
+                            new[key] = nvalue
+                        else:
+                            matched += 1
+                        continue
                 for skey, svalue in s.items():
                     try:
-                        nkey = Schema(skey, error=e).validate(key)
+                        nkey = Schema(skey, error=e,
+                                      structural=structural).validate(key)
                         try:
-                            nvalue = Schema(svalue, error=e).validate(value)
+                            nvalue = Schema(svalue, error=e, copy=self._copy,
+                                            structural=structural
+                                            ).validate(value)
                         except SchemaError as x:
                             err = e
                             raise
@@ -130,7 +242,10 @@ class Schema(object):
                         valid = True
                         break
                 if valid:
-                    new[nkey] = nvalue
+                    if new is not None:
+                        new[nkey] = nvalue
+                    else:
+                        matched += 1
                 elif type(skey) is not Optional and skey is not None:
                     if err is not None:
                         raise SchemaError(['key %r is required' % key] +
@@ -141,10 +256,24 @@ class Schema(object):
             required = set(k for k in s if type(k) is not Optional)
             if coverage != required:
                 raise SchemaError('missed keys %r' % (required - coverage), e)
+            if new is None:
+                if matched != len(data):
+                    raise SchemaError('wrong keys %r in %r' % (s, data), e)
+                return data
             if len(new) != len(data):
                 raise SchemaError('wrong keys %r in %r' % (new, data), e)
             return new
         if hasattr(s, 'validate'):
+            if structural:
+                if type(s) in (Schema, Optional):
+                    s = Schema(s._schema, error=s._error, copy=False,
+                               structural=True)
+                elif type(s) in (And, Or):
+                    s = _Structural(s)
+                else:
+                    return data
+            elif not self._copy and type(s) is Schema:
+                s = Schema(s._schema, error=s._error, copy=False)
             try:
                 return s.validate(data)
             except SchemaError as x:
@@ -158,6 +287,8 @@ class Schema(object):
             else:
                 raise SchemaError('%r should be instance of %r' % (data, s), e)
         if callable(s):
+            if structural:
+                return data
             f = s.__name__
             try:
                 if s(data):
@@ -174,12 +305,40 @@ class Schema(object):
             raise SchemaError('%r does not match %r' % (s, data), e)
 
 
+class _Structural(object):
+
+    """And or Or checking the structure of their arguments only."""
+
+    def __init__(self, s):
+        self._s = s
+
+    def __repr__(self):
+        return repr(self._s)
+
+    def validate(self, data):
+        s = self._s
+        options = [Schema(a, error=s._error, copy=False, structural=True)
+                   for a in s._args]
+        if type(s) is Or:
+            return _first(options, data, s._args, s._error, True)
+        for a, option in zip(s._args, options):
+            option.validate(data)
+            # The arguments after one that transforms see its result, which
+            # isn't computed here
+            if _transforms(a):
+                break
+        return data
+
+
 class Optional(Schema):
 
     """Marker for an optional part of Schema."""
 
 
 def guard(*schemas, **kwschema):
+    # inspect is expensive to import and only needed here
+    from inspect import getargspec
+
     def decorator(oldf):
         spec = getargspec(oldf)
 
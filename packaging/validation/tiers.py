@@ -0,0 +1,78 @@
+import collections
+import random
+import threading
+
+from .schema import Schema, SchemaError
+
+__all__ = ["TieredValidator"]
+
+
+class TieredValidator(object):
+    """
+    Validates documents with the cheap structural tier of ``schema`` (see
+    Schema's ``structural``) and runs the full tier on a random
+    ``sample_rate`` fraction of them, counting the outcomes.
+
+    A document failing the structural tier raises SchemaError. One that
+    passes it but fails the full tier only raises if ``strict`` is True,
+    otherwise it is returned as is and the failure shows up in report()
+    (along with the last ``keep_errors`` error messages).
+    """
+
+    counters = ("validated", "structural_failures", "sampled", "full_failures")
+
+    def __init__(self, schema, sample_rate=0.0, strict=False, keep_errors=10, rng=None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("Invalid sample rate {rate!r}".format(rate=sample_rate))
+
+        if isinstance(schema, Schema):
+            schema = schema._schema
+        self.structural = Schema(schema, structural=True)
+        self.full = Schema(schema)
+        self.sample_rate = sample_rate
+        self.strict = strict
+
+        self._random = rng if rng is not None else random.Random()
+        self._lock = threading.Lock()
+        self._keep_errors = keep_errors
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = dict.fromkeys(self.counters, 0)
+            self._errors = collections.deque(maxlen=self._keep_errors)
+
+    def _increment(self, name, error=None):
+        with self._lock:
+            self._counters[name] += 1
+            if error is not None:
+                self._errors.append(str(error))
+
+    def validate(self, data):
+        self._increment("validated")
+        try:
+            self.structural.validate(data)
+        except SchemaError as exc:
+            self._increment("structural_failures", exc)
+            raise
+
+        if self.sample_rate and self._random.random() < self.sample_rate:
+            self._increment("sampled")
+            try:
+                self.full.validate(data)
+            except SchemaError as exc:
+                self._increment("full_failures", exc)
+                if self.strict:
+                    raise
+
+        return data
+
+    def report(self):
+        """
+        Return the counters and the most recent error messages as a plain
+        dict.
+        """
+        with self._lock:
+            report = dict(self._counters)
+            report["errors"] = list(self._errors)
+            return report
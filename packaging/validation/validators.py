@@ -1,5 +1,7 @@
 import string
 
+from .classifiers import is_classifier
+from .records import Metadata, Dependencies, Distribution
 from .schema import Schema, And, Use, Optional, SchemaError
 from ..version import Version, VersionPredicate
 from ..compat import string_type
@@ -9,22 +11,27 @@ __all__ = [
     "SchemaError",
 
     # Distribution
-    "distribution",
+    "distribution", "distribution_record",
 
     # Metadata
-    "metadata",
+    "metadata", "metadata_record",
     "metadata_name", "metadata_version", "metadata_summary", "metadata_description",
     "metadata_keywords", "metadata_author", "metadata_author_email", "metadata_maintainer",
     "metadata_maintainer_email", "metadata_license", "metadata_classifiers", "metadata_uris",
     "metadata_platforms", "metadata_supported_platforms",
 
     # Dependencies
-    "dependencies",
+    "dependencies", "dependencies_record",
     "dependencies_python", "dependencies_extras", "dependencies_setup_requires",
     "dependencies_requires", "dependencies_provides", "dependencies_obsoletes",
     "dependencies_externals",
 ]
 
+
+def _python_predicate(value):
+    return VersionPredicate("python (%s)" % value)
+
+
 # metadata
 metadata_name = Schema(And(string_type, lambda x: "/" not in x))  # @@@ What exactly is "ok" for a name?
 metadata_version = Schema(Use(Version))
@@ -36,7 +43,7 @@ metadata_author_email = Schema(string_type)  # @@@ Verify Proper Email
 metadata_maintainer = Schema(string_type)
 metadata_maintainer_email = Schema(string_type)  # @@@ Verify Proper Email
 metadata_license = Schema(string_type)
-metadata_classifiers = Schema([string_type])
+metadata_classifiers = Schema([And(string_type, is_classifier)])
 metadata_uris = Schema({And(string_type, lambda x: len(x) <= 32,): string_type})
 metadata_platforms = Schema([string_type])
 metadata_supported_platforms = Schema([string_type])
@@ -58,8 +65,10 @@ metadata = Schema({
     Optional("supported-platforms"): metadata_supported_platforms,
 })
 
+metadata_record = Schema(And(metadata, Use(Metadata.from_dict)))
+
 # dependencies
-dependencies_python = Schema(string_type)  # @@@ Validate the version spec
+dependencies_python = Schema(And(string_type, Use(_python_predicate)))
 dependencies_extras = Schema([And(string_type, lambda x: not set(x) - (set(string.digits + string.ascii_letters + string.punctuation) - set("[],")))])
 dependencies_setup_requires = Schema([Use(VersionPredicate)])
 dependencies_requires = Schema([Use(VersionPredicate)])
@@ -77,8 +86,12 @@ dependencies = Schema({
     Optional("externals"): dependencies_externals,
 })
 
+dependencies_record = Schema(And(dependencies, Use(Dependencies.from_dict)))
+
 
 distribution = Schema({
     "metadata": metadata,
     "dependencies": dependencies,
 })
+
+distribution_record = Schema(And(distribution, Use(Distribution.from_dict)))
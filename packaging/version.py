@@ -1,10 +1,45 @@
+import binascii
+import bisect
 import operator
 import re
+import struct
+import threading
+import time
 
 from .compat import string_type, total_ordering
+from .utils import normalize_name
 
 
-__all__ = ["Version", "VersionPredicate", "suggest"]
+__all__ = [
+    "Version", "LegacyVersion", "VersionPredicate", "parse", "suggest",
+    "sort_versions", "max_version", "dedupe_versions", "external_sort_versions",
+    "enable_metrics", "disable_metrics", "get_metrics", "reset_metrics",
+]
+
+
+class _Regex(object):
+    """
+    A regular expression that is only compiled the first time it is used,
+    keeping the cost of compiling the (verbose) patterns below out of the
+    import of this module.
+
+    The methods of the compiled pattern are stored on the instance as they
+    are looked up, so only the first call to each goes through
+    __getattr__().
+    """
+
+    def __init__(self, pattern, flags=0):
+        self._pattern = pattern
+        self._flags = flags
+        self._compiled = None
+
+    def __getattr__(self, name):
+        if self._compiled is None:
+            self._compiled = re.compile(self._pattern, self._flags)
+        value = getattr(self._compiled, name)
+        setattr(self, name, value)
+        return value
+
 
 # A marker used in the second and third parts of the `parts` tuple, for
 # versions that don't have those segments, to sort properly. An example
@@ -24,10 +59,157 @@ __all__ = ["Version", "VersionPredicate", "suggest"]
 # 'rc' we must use 'z'
 
 
+# perf_counter() is monotonic and fine grained enough for the 1us buckets,
+# Python 2 only has time()
+_clock = getattr(time, "perf_counter", time.time)
+
+
+class _Metrics(object):
+    """
+    Counters, and optionally timing histograms, for the hot paths of this
+    module. Only one instance exists at a time and only while metrics are
+    enabled, so the cost when they are disabled is a single ``is None``
+    check per call.
+    """
+
+    # Upper bounds, in seconds, of the timing histogram buckets
+    buckets = (0.000001, 0.00001, 0.0001, 0.001, 0.01, 0.1)
+
+    counters = ("versions", "parse_errors", "comparisons", "suggest")
+
+    def __init__(self, timings=False):
+        self.timings = timings
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._counters = dict.fromkeys(self.counters, 0)
+            self._histograms = {}
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = {
+                    "count": 0, "sum": 0.0,
+                    "buckets": [0] * (len(self.buckets) + 1),
+                }
+            histogram["count"] += 1
+            histogram["sum"] += seconds
+            histogram["buckets"][bisect.bisect_left(self.buckets, seconds)] += 1
+
+    def measure(self, name, func, *args):
+        """
+        Call ``func(*args)``, counting the call (for "parse", the Version
+        built or the ValueError raised) and recording how long it took if
+        timings are enabled.
+        """
+        if name != "parse":
+            self.increment(name)
+
+        start = _clock() if self.timings else None
+        try:
+            result = func(*args)
+        except ValueError:
+            if name == "parse":
+                self.increment("parse_errors")
+            raise
+        finally:
+            if start is not None:
+                self.observe(name, _clock() - start)
+
+        if name == "parse":
+            self.increment("versions")
+        return result
+
+    def snapshot(self):
+        with self._lock:
+            timings = {}
+            for name, histogram in self._histograms.items():
+                bounds = [str(b) for b in self.buckets] + ["+Inf"]
+                timings[name] = {
+                    "count": histogram["count"],
+                    "sum": histogram["sum"],
+                    "buckets": dict(zip(bounds, histogram["buckets"])),
+                }
+            return {"counters": dict(self._counters), "timings": timings}
+
+
+_metrics = None
+
+
+def enable_metrics(timings=False):
+    """
+    Start counting Version objects created, parse errors, comparisons and
+    calls to suggest(). If ``timings`` is True parsing and suggest() are
+    also timed into histograms. Any previously collected metrics are
+    discarded.
+    """
+    global _metrics
+    _metrics = _Metrics(timings=timings)
+
+
+def disable_metrics():
+    global _metrics
+    _metrics = None
+
+
+def get_metrics():
+    """
+    Return a snapshot of the collected metrics as a plain dict, or None if
+    metrics are not enabled.
+    """
+    metrics = _metrics
+    if metrics is not None:
+        return metrics.snapshot()
+
+
+def reset_metrics():
+    metrics = _metrics
+    if metrics is not None:
+        metrics.reset()
+
+
 @total_ordering
-class Version(object):
+class _BaseVersion(object):
+    """
+    Comparisons and hashing for Version and LegacyVersion, done on the
+    ``_sort_key`` each instance computes once. Keys of legacy versions start
+    with 0 and those of valid versions with 1, so every LegacyVersion sorts
+    before every Version.
+    """
+
+    def __eq__(self, other):
+        if not isinstance(other, _BaseVersion):
+            return NotImplemented
+        metrics = _metrics
+        if metrics is not None:
+            metrics.increment("comparisons")
+        return self._sort_key == other._sort_key
 
-    _version_regex = re.compile(r"""
+    def __ne__(self, other):
+        return not (self == other)
+
+    def __lt__(self, other):
+        if not isinstance(other, _BaseVersion):
+            return NotImplemented
+        metrics = _metrics
+        if metrics is not None:
+            metrics.increment("comparisons")
+        return self._sort_key < other._sort_key
+
+    def __hash__(self):
+        return hash(self._sort_key)
+
+
+class Version(_BaseVersion):
+
+    _version_regex = _Regex(r"""
         ^
         (?P<version>\d+\.\d+(?:\.\d+)*)          # minimum 'N.N'
         (?:
@@ -42,7 +224,13 @@ class Version(object):
         super(Version, self).__init__(*args, **kwargs)
 
         self.version = version
-        self.parts = self._parse(self.version)
+        # Read the global once, another thread may disable metrics
+        metrics = _metrics
+        if metrics is None:
+            self.parts = self._parse(self.version)
+        else:
+            self.parts = metrics.measure("parse", self._parse, self.version)
+        self._sort_key = (1, _key(self.parts))
 
     def __str__(self):
         return self.version
@@ -50,31 +238,12 @@ class Version(object):
     def __repr__(self):
         return "%s('%s')" % (self.__class__.__name__, self)
 
-    def __eq__(self, other):
-        if not isinstance(other, Version):
-            return NotImplemented
-
-        left, right = self._normalize(self.parts, other.parts)
-        return left == right
-
-    def __ne__(self, other):
-        return not (self == other)
-
-    def __lt__(self, other):
-        if not isinstance(other, Version):
-            return NotImplemented
-
-        left, right = self._normalize(self.parts, other.parts)
-        return left < right
-
-    def __hash__(self):
-        return hash(self.parts)
-
     @property
     def final(self):
         return all([x[-1] == "z" for x in self.parts[1:]])
 
-    def _parse(self, version):
+    @classmethod
+    def _parse(cls, version):
         """
         Parses a string version into parts.
         """
@@ -89,7 +258,7 @@ class Version(object):
 
             return [cast(n) for n in numerical.split(".")]
 
-        match = self._version_regex.search(version)
+        match = cls._version_regex.search(version)
 
         if not match:
             raise ValueError("Invalid version '{version}'".format(version=version))
@@ -130,24 +299,322 @@ class Version(object):
 
         return tuple(parts)
 
-    @staticmethod
-    def _normalize(*all_parts):
-        def pad(parts, target):
-            amount = target - len(parts[0])
-            return (parts[0] + (0,) * amount,) + parts[1:]
 
-        length = max([len(parts[0]) for parts in all_parts])
-        return [pad(parts, length) for parts in all_parts]
+class LegacyVersion(_BaseVersion):
+    """
+    Any version string Version can't parse, ordered the way setuptools
+    orders them and always before every Version.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        self._sort_key = (0, _legacy_key(version))
+
+    def __str__(self):
+        return self.version
+
+    def __repr__(self):
+        return "%s('%s')" % (self.__class__.__name__, self)
 
 
-def _same_series(version, target):
+def parse(version):
+    """
+    Return a Version for ``version`` if it is valid, otherwise a
+    LegacyVersion.
+    """
     try:
-        version = [int(x.strip()) for x in str(version).split(".")]
-        target = [int(x.strip()) for x in str(target).split(".")]
+        return Version(version)
     except ValueError:
+        return LegacyVersion(version)
+
+
+def _key(parts):
+    """
+    Turn the ``parts`` of a version into a tuple that compares (and hashes)
+    as Version does: as release numbers are never negative, dropping
+    trailing zeros orders releases exactly like padding them to the same
+    length, so "1.0" and "1.0.0" get the same key.
+    """
+    release = parts[0]
+    end = len(release)
+    while end and release[end - 1] == 0:
+        end -= 1
+    return (release[:end],) + parts[1:]
+
+
+# Every string that can appear in a key, ranked in their sort order
+_KEY_STRINGS = dict([(s, i + 1) for i, s in enumerate(sorted(["a", "b", "c", "rc", "dev", "post", "z"]))])
+
+
+def _encode_key(key):
+    """
+    Encode a key from _key() as bytes that sort, and compare equal, exactly
+    like the key itself, so that versions can be compared without decoding.
+
+    Each part of the key is a sequence of tagged items (``\x01`` and a
+    rank for strings, ``\x02``, a length byte and the big endian bytes for
+    integers, so a longer integer is always a larger one) ended by
+    ``\x00``, which makes a shorter part sort before any longer one it is
+    a prefix of. Strings and integers never meet at the same position of
+    two keys that are otherwise equal, so their relative order is moot.
+
+    Raises ValueError for an integer of more than 255 bytes.
+    """
+    encoded = []
+    for part in key:
+        for item in part:
+            if isinstance(item, string_type):
+                encoded.append(struct.pack(">BB", 1, _KEY_STRINGS[item]))
+                continue
+
+            digits = "%x" % item if item else ""
+            data = binascii.unhexlify("0" * (len(digits) % 2) + digits)
+            if len(data) > 255:
+                raise ValueError("Version number {number} is too large".format(number=item))
+            encoded.append(struct.pack(">BB", 2, len(data)) + data)
+        encoded.append(b"\x00")
+    return b"".join(encoded)
+
+
+_legacy_component_regex = _Regex(r"(\d+|[a-z]+|\.|-)")
+
+_legacy_replacements = {"pre": "c", "preview": "c", "-": "final-", "rc": "c", "dev": "@"}
+
+
+def _legacy_parts(version):
+    for part in _legacy_component_regex.split(version.lower()):
+        part = _legacy_replacements.get(part, part)
+        if not part or part == ".":
+            continue
+        if part[:1] in "0123456789":
+            # Pad numbers so they compare as strings
+            yield part.zfill(8)
+        else:
+            yield "*" + part
+    yield "*final"
+
+
+def _legacy_key(version):
+    """
+    The key setuptools' parse_version() orders the versions it can't make
+    sense of by.
+    """
+    parts = []
+    for part in _legacy_parts(version):
+        if part.startswith("*"):
+            # Remove "-" before a pre-release tag
+            if part < "*final":
+                while parts and parts[-1] == "*final-":
+                    parts.pop()
+            # Remove trailing zeros from each series of numeric parts
+            while parts and parts[-1] == "00000000":
+                parts.pop()
+        parts.append(part)
+    return tuple(parts)
+
+
+def _parts(version, skip_invalid=False, fuzzy=False):
+    """
+    Return the parts of ``version``, or of what suggest() makes of it if
+    ``fuzzy`` is set. Invalid versions return None if ``skip_invalid`` is
+    set and raise ValueError otherwise.
+    """
+    parse = Version._parse
+
+    try:
+        return parse(version)
+    except ValueError:
+        suggested = suggest(version, cls=parse) if fuzzy else None
+        if suggested is not None:
+            return parse(suggested)
+        if skip_invalid:
+            return None
+        raise
+
+
+def _keys(versions, skip_invalid=False, fuzzy=False, legacy=False):
+    """
+    Yield a ``(key, version)`` pair for each version string, without
+    creating Version objects.
+
+    Invalid versions raise ValueError unless ``fuzzy`` is set and suggest()
+    can make sense of them, or ``skip_invalid`` is set. With ``legacy`` they
+    get the key of a LegacyVersion instead, and every key is the
+    ``_sort_key`` of the corresponding Version or LegacyVersion so they can
+    be compared with each other.
+    """
+    for version in versions:
+        try:
+            parts = _parts(version, skip_invalid and not legacy, fuzzy)
+        except ValueError:
+            if not legacy:
+                raise
+            yield (0, _legacy_key(version)), version
+            continue
+        if parts is not None:
+            yield ((1, _key(parts)) if legacy else _key(parts)), version
+
+
+def sort_versions(versions, reverse=False, skip_invalid=False, fuzzy=False, legacy=False):
+    """
+    Return a list of the given version strings in version order.
+
+    Each string is parsed once into a comparison key, which is much
+    cheaper than sorting Version objects. See _keys() for ``skip_invalid``,
+    ``fuzzy`` and ``legacy`` (which sorts invalid versions first, like
+    LegacyVersion does).
+    """
+    pairs = sorted(_keys(versions, skip_invalid, fuzzy, legacy), key=operator.itemgetter(0), reverse=reverse)
+    return [version for _, version in pairs]
+
+
+def max_version(versions, skip_invalid=False, fuzzy=False, legacy=False):
+    """
+    Return the newest of the given version strings, or None if there are
+    none.
+    """
+    best = None
+    for key, version in _keys(versions, skip_invalid, fuzzy, legacy):
+        if best is None or key > best[0]:
+            best = key, version
+    return best[1] if best is not None else None
+
+
+def dedupe_versions(versions, skip_invalid=False, fuzzy=False, legacy=False):
+    """
+    Return the given version strings without those equal to an earlier one
+    (e.g. "1.0.0" after "1.0"), keeping their original order.
+    """
+    seen = set()
+    unique = []
+    for key, version in _keys(versions, skip_invalid, fuzzy, legacy):
+        if key not in seen:
+            seen.add(key)
+            unique.append(version)
+    return unique
+
+
+# Rows held in memory per sorted run by external_sort_versions(), each
+# costs roughly 200 bytes
+RUN_SIZE = 1000000
+
+# Distinct version strings whose keys external_sort_versions() remembers;
+# the same few thousand versions make up most of any large corpus
+KEY_CACHE_SIZE = 100000
+
+_RECORD = struct.Struct(">II")
+
+
+def _write_run(rows, fp):
+    rows.sort()
+    for key, value in rows:
+        fp.write(_RECORD.pack(len(key), len(value)))
+        fp.write(key)
+        fp.write(value)
+    fp.seek(0)
+
+
+def _read_run(fp):
+    while True:
+        header = fp.read(_RECORD.size)
+        if not header:
+            return
+        key_length, value_length = _RECORD.unpack(header)
+        yield fp.read(key_length), fp.read(value_length)
+
+
+def external_sort_versions(rows, run_size=RUN_SIZE, dedupe=False, skip_invalid=False, fuzzy=False, directory=None):
+    """
+    Yield version strings, or ``(project, version)`` pairs, in order, using
+    at most ``run_size`` rows of memory (None for no limit) however many
+    rows there are. Pairs are ordered by project, then by version.
+
+    Rows are turned into compact byte keys (see _encode_key) and sorted in
+    runs of ``run_size``, which are spilled to temporary files in
+    ``directory`` and merged with heapq.merge(). With ``dedupe`` only one
+    of the rows with equal versions (e.g. "1.0" and "1.0.0") is kept, the
+    one sorting first as a string. See _parts() for ``skip_invalid`` and
+    ``fuzzy``.
+    """
+    import heapq
+    import tempfile
+
+    runs = []
+    rows_in_run = []
+    pairs = None
+    cache = {}
+
+    try:
+        for row in rows:
+            if pairs is None:
+                pairs = not isinstance(row, string_type)
+            if pairs:
+                project, version = row
+            else:
+                project, version = None, row
+
+            key = cache.get(version)
+            if key is None:
+                parts = _parts(version, skip_invalid, fuzzy)
+                if parts is None:
+                    continue
+                key = _encode_key(_key(parts))
+                if len(cache) < KEY_CACHE_SIZE:
+                    cache[version] = key
+
+            if pairs:
+                # Project names can't contain NUL, so a shorter name sorts
+                # before every longer one it is a prefix of
+                key = project.encode("utf-8") + b"\x00" + key
+                version = project + "\x00" + version
+            rows_in_run.append((key, version.encode("utf-8")))
+
+            if run_size is not None and len(rows_in_run) >= run_size:
+                fp = tempfile.TemporaryFile(dir=directory)
+                runs.append(fp)
+                _write_run(rows_in_run, fp)
+                rows_in_run = []
+
+        rows_in_run.sort()
+        merged = heapq.merge(rows_in_run, *[_read_run(fp) for fp in runs])
+
+        last = None
+        for key, value in merged:
+            if dedupe:
+                if key == last:
+                    continue
+                last = key
+            value = value.decode("utf-8")
+            yield tuple(value.split("\x00", 1)) if pairs else value
+    finally:
+        for fp in runs:
+            fp.close()
+
+
+def _is_release(parts):
+    # Only plain releases ("1.4.2") belong to a series
+    return parts[1] == ("z",) and parts[2] == ("z",)
+
+
+def _same_series(version, target):
+    """
+    Return True if ``version`` is a plain release whose release numbers
+    start with those of ``target`` (e.g. "1.4.2" is in the series "1.4").
+    """
+    if isinstance(version, string_type):
+        try:
+            version = Version(version)
+        except ValueError:
+            return False
+
+    if not isinstance(version, Version):
         return False
 
-    return target == version[:len(target)]
+    if not (_is_release(version.parts) and _is_release(target.parts)):
+        return False
+
+    release = target.parts[0]
+    return version.parts[0][:len(release)] == release
 
 
 class VersionPredicate(object):
@@ -155,9 +622,9 @@ class VersionPredicate(object):
     Defines a predicate: ProjectName (>ver1,ver2, ..)
     """
 
-    _predicate_regex = re.compile(r"(?i)^\s*(\w[\s\w-]*(?:\.\w*)*)(.*)")
-    _versions_regex = re.compile(r"^\s*\((?P<versions>.*)\)\s*$")
-    _split_cmp_regex = re.compile(r"^\s*(<=|>=|<|>|!=|==)\s*([^\s,]+)\s*$")
+    _predicate_regex = _Regex(r"(?i)^\s*(\w[\s\w-]*(?:\.\w*)*)(.*)")
+    _versions_regex = _Regex(r"^\s*\((?P<versions>.*)\)\s*$")
+    _split_cmp_regex = _Regex(r"^\s*(<=|>=|<|>|!=|==)\s*([^\s,]+)\s*$")
 
     _operators = {
         "": _same_series,
@@ -179,6 +646,8 @@ class VersionPredicate(object):
 
         name, predicates = match.groups()
         self.name = name.strip()
+        # The normalized name, for looking the project up in indexes
+        self.key = normalize_name(self.name)
         self.predicates = set()
 
         if not predicates:
@@ -243,6 +712,13 @@ def suggest(version, cls=Version):
     @param version {str} An irrational version string.
     @returns A rational version string, or None, if couldn't determine one.
     """
+    metrics = _metrics
+    if metrics is not None:
+        return metrics.measure("suggest", _suggest, version, cls)
+    return _suggest(version, cls)
+
+
+def _suggest(version, cls):
     try:
         cls(version)
         return version   # already rational
@@ -0,0 +1,112 @@
+import sys
+import threading
+
+import pytest
+
+pytestmark = pytest.mark.skipif(sys.version_info < (3, 7), reason="requires Python 3.7+")
+
+asyncio = pytest.importorskip("asyncio")
+
+from packaging import aio
+from packaging.validation import validators
+from packaging.version import Version
+
+
+DOCUMENT = {
+    "name": "packaging",
+    "version": "0.1",
+    "summary": "Packaging primitives",
+}
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_validate_async():
+    assert run(aio.validate_async(DOCUMENT, schema="metadata")) == validators.metadata.validate(DOCUMENT)
+
+
+def test_validate_async_invalid():
+    with pytest.raises(validators.SchemaError):
+        run(aio.validate_async({"name": "packaging"}, schema=validators.metadata))
+
+
+def test_parse_versions_async():
+    versions = run(aio.parse_versions_async(["1.0", "2.0", "1.5"], batch_size=2))
+    assert versions == [Version("1.0"), Version("2.0"), Version("1.5")]
+
+    with pytest.raises(ValueError):
+        run(aio.parse_versions_async(["1.0", "invalid"]))
+
+
+def test_iter_validate():
+    documents = [DOCUMENT, {"name": "packaging"}] * 5
+
+    async def collect():
+        return [r async for r in aio.iter_validate(documents, schema="metadata", batch_size=3, max_pending=2)]
+
+    results = run(collect())
+    assert [ok for ok, _ in results] == [True, False] * 5
+    assert results[0][1]["version"] == Version("0.1")
+    assert isinstance(results[1][1], validators.SchemaError)
+
+
+def test_async_validator_batches():
+    async def main():
+        async with aio.AsyncValidator(schema="metadata", batch_size=4, max_pending=2) as validator:
+            results = await asyncio.gather(
+                *[validator.validate(dict(DOCUMENT, version="1.%d" % i)) for i in range(10)]
+            )
+            with pytest.raises(validators.SchemaError):
+                await validator.validate({"name": "packaging"})
+            return results
+
+    results = run(main())
+    assert [r["version"] for r in results] == [Version("1.%d" % i) for i in range(10)]
+
+
+def test_async_validator_close_cancels_pending():
+    async def main():
+        validator = aio.AsyncValidator(schema="metadata", max_pending=1, concurrency=1)
+        task = asyncio.ensure_future(validator.validate(DOCUMENT))
+        await asyncio.sleep(0)
+        await validator.close()
+        await asyncio.sleep(0)
+        return task
+
+    task = run(main())
+    assert task.cancelled()
+
+
+def test_async_validator_close_cancels_waiting_callers():
+    started, release = threading.Event(), threading.Event()
+
+    def slow(document):
+        started.set()
+        return release.wait(5)
+
+    async def main():
+        validator = aio.AsyncValidator(schema=validators.Schema(slow), batch_size=1, max_pending=1, concurrency=1)
+        tasks = [asyncio.ensure_future(validator.validate(i)) for i in range(4)]
+        while not started.is_set():
+            await asyncio.sleep(0.01)
+        await validator.close()
+        release.set()
+        await asyncio.wait(tasks, timeout=1)
+
+        with pytest.raises(RuntimeError):
+            await validator.validate(0)
+        return tasks
+
+    tasks = run(main())
+    assert all([task.cancelled() for task in tasks])
+
+
+def test_parse_versions_async_bounded():
+    def strings():
+        for i in range(50):
+            yield "1.%d" % i
+
+    versions = run(aio.parse_versions_async(strings(), batch_size=7, max_pending=2))
+    assert versions == [Version("1.%d" % i) for i in range(50)]
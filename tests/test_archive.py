@@ -0,0 +1,114 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from packaging import archive
+from packaging.validation import validators
+from packaging.version import Version, VersionPredicate
+
+
+METADATA = b"""Metadata-Version: 2.1
+Name: packaging
+Version: 0.1
+Summary: Packaging primitives
+Requires-Python: >=2.6
+Requires-Dist: zope.interface (>3.5.0)
+Requires-Dist: requests[security]>=1.0,<3.0; python_version < "3"
+Provides-Extra: tests
+Requires-Dist: pytest; extra == "tests"
+"""
+
+
+def make_wheel(path, metadata=METADATA):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as wheel:
+        wheel.writestr("packaging/__init__.py", b"")
+        wheel.writestr("packaging-0.1.dist-info/METADATA", metadata)
+        wheel.writestr("packaging-0.1.dist-info/RECORD", b"")
+
+
+def make_sdist(path, metadata=METADATA):
+    with tarfile.open(path, "w:gz") as sdist:
+        for name, data in [("packaging-0.1/setup.py", b""),
+                           ("packaging-0.1/packaging/PKG-INFO", b"Name: wrong\n"),
+                           ("packaging-0.1/PKG-INFO", metadata)]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            sdist.addfile(info, io.BytesIO(data))
+
+
+@pytest.mark.parametrize(("filename", "make"), [
+    ("packaging-0.1-py2.py3-none-any.whl", make_wheel),
+    ("packaging-0.1.tar.gz", make_sdist),
+])
+def test_read_metadata(tmpdir, filename, make):
+    path = str(tmpdir.join(filename))
+    make(path)
+
+    data = archive.read_metadata(path)
+    assert data == {
+        "metadata": {"name": "packaging", "version": "0.1", "summary": "Packaging primitives"},
+        "dependencies": {
+            "python": ">=2.6",
+            "requires": ["zope.interface (>3.5.0)", "requests (>=1.0,<3.0)"],
+            "extras": ["tests"],
+            "provides": ["packaging (0.1)"],
+        },
+    }
+
+    validated = validators.distribution.validate(data)
+    assert validated["metadata"]["version"] == Version("0.1")
+    assert validated["dependencies"]["requires"][1] == VersionPredicate("requests (>=1.0,<3.0)")
+
+
+def test_read_metadata_limits(tmpdir):
+    path = str(tmpdir.join("packaging-0.1.tar.gz"))
+    make_sdist(path)
+
+    with pytest.raises(ValueError):
+        archive.read_metadata(path, max_size=10)
+
+
+def test_read_metadata_prefers_dist_info(tmpdir):
+    path = str(tmpdir.join("packaging-0.1-py2.py3-none-any.whl"))
+    with zipfile.ZipFile(path, "w") as wheel:
+        wheel.writestr("foo/PKG-INFO", b"Name: wrong\nVersion: 9.9\n")
+        wheel.writestr("packaging-0.1.dist-info/METADATA", METADATA)
+
+    assert archive.read_metadata(path)["metadata"]["name"] == "packaging"
+
+
+def test_read_metadata_dot_prefix(tmpdir):
+    path = str(tmpdir.join("packaging-0.1.tar.gz"))
+    with tarfile.open(path, "w:gz") as sdist:
+        info = tarfile.TarInfo("./packaging-0.1/PKG-INFO")
+        info.size = len(METADATA)
+        sdist.addfile(info, io.BytesIO(METADATA))
+
+    assert archive.read_metadata(path)["metadata"]["name"] == "packaging"
+
+
+def test_read_metadata_missing(tmpdir):
+    path = str(tmpdir.join("empty.zip"))
+    with zipfile.ZipFile(path, "w") as empty:
+        empty.writestr("README", b"")
+
+    with pytest.raises(ValueError):
+        archive.read_metadata(path)
+
+
+def test_iter_archives(tmpdir):
+    make_wheel(str(tmpdir.join("packaging-0.1-py2.py3-none-any.whl")))
+    make_sdist(str(tmpdir.join("packaging-0.1.tar.gz")))
+    make_sdist(str(tmpdir.join("broken-0.1.tar.gz")), metadata=b"Name: broken\n")
+    tmpdir.join("README").write_binary(b"")
+
+    results = list(archive.iter_archives(str(tmpdir), validator=validators.distribution))
+
+    assert [r[0][len(str(tmpdir)) + 1:] for r in results] == [
+        "broken-0.1.tar.gz",
+        "packaging-0.1-py2.py3-none-any.whl",
+        "packaging-0.1.tar.gz",
+    ]
+    assert [r[1] for r in results] == [False, True, True]
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+import pytest
+
+import packaging
+from packaging import version
+
+
+# Upper bound, in microseconds, on the cumulative time ``-X importtime``
+# reports for importing packaging.version (including the stdlib modules it
+# pulls in). It is deliberately generous; the module assertions below are
+# what catch eager imports creeping back in.
+IMPORT_BUDGET = 50000
+
+
+def _importtime(statement):
+    output = subprocess.check_output(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.STDOUT,
+    ).decode("utf-8")
+
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_lazy_namespace():
+    assert packaging.Version is version.Version
+    assert packaging.VersionPredicate is version.VersionPredicate
+    assert packaging.suggest is version.suggest
+    assert hasattr(packaging.validators, "distribution")
+    assert "Version" in dir(packaging)
+
+    with pytest.raises(AttributeError):
+        packaging.DoesNotExist
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="-X importtime requires Python 3.7+")
+def test_import_packaging_is_empty():
+    times = _importtime("import packaging")
+    assert [m for m in times if m.startswith("packaging.")] == []
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="-X importtime requires Python 3.7+")
+def test_import_version_budget():
+    times = _importtime("import packaging.version; packaging.version.Version('1.0')")
+
+    assert "packaging.validation" not in times
+    assert "inspect" not in times
+    assert times["packaging.version"] < IMPORT_BUDGET
@@ -0,0 +1,325 @@
+import sys
+
+try:
+    # Python 2: takes the native strings json.dumps() returns
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+import pytest
+
+from packaging.index.columns import ColumnStore
+from packaging.index.graph import DependencyGraph
+from packaging.index.names import NameIndex
+from packaging.index.predicates import PredicateIndex
+from packaging.index.python import PythonIndex
+from packaging.index.search import SearchIndex
+from packaging.index.series import SeriesTrie
+from packaging.validation import validators
+from packaging.version import Version, VersionPredicate, disable_metrics, enable_metrics, get_metrics
+
+
+def dependencies(**kwargs):
+    data = {"provides": []}
+    data.update([(k.replace("_", "-"), v) for k, v in kwargs.items()])
+    return validators.dependencies.validate(data)
+
+
+@pytest.fixture
+def graph():
+    graph = DependencyGraph()
+    graph.add("zope.interface", "3.6.0", dependencies(provides=["zope.interface (3.6.0)"]))
+    graph.add("Twisted", "12.0", dependencies(requires=["zope.interface (>3.5.0)"]))
+    graph.add("Foo_Bar", "1.0", dependencies(requires=["twisted"], provides=["foo-bar (1.0)", "virtual.web"]))
+    graph.add("webapp", "2.0", dependencies(requires=["Virtual.Web"], obsoletes=["oldapp"]))
+    graph.add("unrelated", "1.0", dependencies())
+    return graph
+
+
+def test_direct_queries(graph):
+    assert graph.required_by("Zope.Interface") == set([("twisted", "12.0")])
+    assert graph.provided_by("virtual_web") == set([("foo-bar", "1.0")])
+    assert graph.obsoleted_by("OldApp") == set([("webapp", "2.0")])
+    assert graph.edges("twisted", "12.0", "requires") == ["zope.interface (>3.5.0)"]
+
+
+def test_transitive_required_by(graph):
+    expected = set([("twisted", "12.0"), ("foo-bar", "1.0"), ("webapp", "2.0")])
+
+    assert graph.transitive_required_by("zope.interface") == expected
+    # memoized
+    assert graph.transitive_required_by("zope-interface") == expected
+
+
+def test_incremental_updates(graph):
+    graph.transitive_required_by("zope.interface")
+
+    graph.remove("foo-bar", "1.0")
+    assert graph.transitive_required_by("zope.interface") == set([("twisted", "12.0")])
+    assert graph.provided_by("virtual.web") == set()
+
+    graph.add("twisted", "12.0", dependencies())
+    assert graph.required_by("zope.interface") == set()
+    assert len(graph) == 4
+
+    with pytest.raises(KeyError):
+        graph.remove("foo-bar", "1.0")
+
+
+def test_dump_load(graph):
+    fp = StringIO()
+    graph.dump(fp)
+    fp.seek(0)
+
+    loaded = DependencyGraph.load(fp)
+    assert len(loaded) == len(graph)
+    assert loaded.transitive_required_by("zope.interface") == graph.transitive_required_by("zope.interface")
+    assert loaded.edges("webapp", "2.0", "obsoletes") == ["oldapp"]
+
+
+PREDICATES = [
+    "Foo",
+    "Foo (>=2.5,<2.7)",
+    "Foo (<3.0,!=2.6)",
+    "Foo (2.5)",
+    "Foo (2.5,!=2.5.1)",
+    "Foo (>2.5)",
+    "Foo (<=2.5)",
+    "Foo (==2.6.0)",
+    "Foo (>=3.0,<2.0)",
+    "Foo (2.5a1)",
+]
+
+
+@pytest.mark.parametrize("version", [
+    "2.5", "2.5.0", "2.5.1", "2.5.5a1", "2.6", "2.6.0.post1", "2.7", "3.0", "1.0.dev1",
+])
+def test_predicate_index_match(version):
+    predicates = [VersionPredicate(p) for p in PREDICATES]
+    index = PredicateIndex(predicates)
+
+    assert len(index) == len(predicates)
+    assert sorted([str(p) for p in index.match(version)]) == sorted([str(p) for p in predicates if p.match(version)])
+
+
+def test_predicate_index_remove():
+    first, second = VersionPredicate("Foo (>=1.0)"), VersionPredicate("Foo (1.0)")
+    index = PredicateIndex([first, second])
+
+    assert len(index.match(Version("1.0.1"))) == 2
+
+    index.remove(first)
+    assert index.match(Version("1.0.1")) == [second]
+
+    index.remove(second)
+    assert index.match(Version("1.0.1")) == []
+
+    with pytest.raises(ValueError):
+        index.remove(second)
+
+
+def test_python_index():
+    index = PythonIndex(["2.6", "2.7", "3.2", "3.3"])
+    index.add("foo", "1.0")
+    index.add("foo", "2.0", ">=2.7")
+    index.add("foo", "3.0", validators.dependencies_python.validate(">=3.0"))
+    index.add("foo", "4.0", "2.7")
+
+    assert sorted(index.compatible("foo", "2.6")) == ["1.0"]
+    assert sorted(index.compatible("foo", "2.7")) == ["1.0", "2.0", "4.0"]
+    assert sorted(index.compatible("foo", "3.3")) == ["1.0", "2.0", "3.0"]
+    assert index.compatible("bar", "3.3") == []
+    assert index.is_compatible("foo", "3.0", "3.2")
+    assert index.pythons_for("foo", "2.0") == ["2.7", "3.2", "3.3"]
+
+    index.remove("foo", "1.0")
+    assert index.compatible("foo", "2.6") == []
+
+    index.add("Foo_Bar", "1.0", ">=3.0")
+    assert index.compatible("foo-bar", "3.2") == ["1.0"]
+    assert index.compatible(VersionPredicate("FOO.BAR"), "3.2") == ["1.0"]
+    assert index.is_compatible("foo.bar", "1.0", "3.3")
+    assert index.pythons_for("FOO-BAR", "1.0") == ["3.2", "3.3"]
+    index.remove("foo_bar", "1.0")
+    assert index.compatible("Foo_Bar", "3.2") == []
+
+    with pytest.raises(ValueError):
+        index.compatible("foo", "3.4")
+
+
+def test_series_trie():
+    trie = SeriesTrie(["1.3", "1.3.1", "1.4a1", "1.4", "1.4.1.post1", "1.4.2b1", "2.0.dev1"])
+
+    assert len(trie) == 7
+    assert "1.4.1.post1" in trie
+    assert trie.latest() == "2.0.dev1"
+    assert trie.latest(final=True) == "1.4.1.post1"
+    assert trie.latest("1.4") == "1.4.2b1"
+    assert trie.latest("1.3") == "1.3.1"
+    assert trie.latest("3") is None
+    assert trie.oldest("1") == "1.3"
+    assert trie.series() == [("1", 6), ("2", 1)]
+    assert trie.series("1") == [("1.3", 2), ("1.4", 4)]
+    assert trie.versions("1.4") == ["1.4a1", "1.4", "1.4.1.post1", "1.4.2b1"]
+    assert trie.match("foo (1.4)") == ["1.4"]
+    assert trie.match("foo (1.3,!=1.3.1)") == ["1.3"]
+    assert trie.match("foo (>=1.4)") == ["1.4", "1.4.1.post1", "1.4.2b1", "2.0.dev1"]
+
+    trie.remove("1.4.1.post1")
+    assert trie.latest("1.4", final=True) == "1.4"
+    assert trie.series("1.4") == [("1.4.2", 1)]
+
+    trie.remove("2.0.dev1")
+    assert trie.series() == [("1", 5)]
+
+    with pytest.raises(KeyError):
+        trie.remove("2.0.dev1")
+
+
+def test_series_trie_trailing_zeros():
+    trie = SeriesTrie(["1.4", "1.4.0", "1.4.0.0", "1.4.1"])
+
+    # Equal versions are one entry, under the first spelling added
+    assert len(trie) == 2
+    assert trie.count("1.4") == 2
+    assert trie.count("1.4.0") == 0
+    assert trie.versions() == ["1.4", "1.4.1"]
+    assert "1.4.0" in trie
+
+    trie.remove("1.4.0")
+    assert "1.4" not in trie
+    assert trie.versions() == ["1.4.1"]
+    with pytest.raises(KeyError):
+        trie.remove("1.4")
+
+
+def test_series_trie_match_does_not_parse():
+    trie = SeriesTrie(["1.3", "1.3.1", "1.4", "2.0"])
+    predicate = VersionPredicate("foo (>=1.3.1,!=1.4)")
+
+    enable_metrics()
+    try:
+        assert trie.match(predicate) == ["1.3.1", "2.0"]
+        assert get_metrics()["counters"]["versions"] == 0
+    finally:
+        disable_metrics()
+
+
+def releases():
+    licenses = ["MIT", "BSD", "MIT", None, "GPL", "MIT"]
+    for number, license in enumerate(licenses):
+        data = {"name": "project%d" % (number % 3), "version": Version("1.%d" % number), "summary": "A project"}
+        if license is not None:
+            data["license"] = license
+        if number % 2:
+            data["platforms"] = ["Linux", "Windows", "Linux"]
+        yield data
+
+
+def test_column_store(tmpdir):
+    store = ColumnStore(releases())
+    store.add(validators.metadata_record.validate({"name": "other", "version": "2.0", "summary": "", "license": "BSD"}))
+
+    assert len(store) == 7
+    assert store.count("license", "MIT") == 3
+    assert store.count("license", "Apache") == 0
+    assert store.where("license", "BSD") == [1, 6]
+    assert store.where("platforms", "Linux") == [1, 3, 5]
+    assert store.count("platforms", "Linux") == 3
+    assert store.select({"license": "MIT", "platforms": "Windows"}) == [5]
+    assert store.select({"license": "MIT", "name": "project1"}) == []
+    assert store.counts("license") == {"MIT": 3, "BSD": 2, "GPL": 1}
+    assert store.row(3) == {"name": "project0", "version": "1.3", "platforms": ["Linux", "Windows"]}
+
+    with pytest.raises(ValueError):
+        store.count("summary", "A project")
+
+    path = str(tmpdir.join("store"))
+    store.save(path)
+
+    for loaded in (ColumnStore.load(store.dumps()), ColumnStore.open(path)):
+        assert len(loaded) == 7
+        assert [loaded.row(i) for i in range(7)] == [store.row(i) for i in range(7)]
+        assert loaded.where("platforms", "Windows") == [1, 3, 5]
+        assert loaded.count("license", "MIT") == 3
+        assert loaded.counts("license") == store.counts("license")
+        if sys.byteorder == "little" and hasattr(memoryview, "cast"):
+            # Queries read the codes straight out of the buffer
+            assert isinstance(loaded._columns["license"].codes, memoryview)
+
+        loaded.add({"name": "new", "version": "1.0", "summary": "", "platforms": ["Mac"]})
+        assert loaded.where("platforms", "Mac") == [7]
+        assert loaded.count("license", "MIT") == 3
+
+
+def test_column_store_text():
+    store = ColumnStore([{"name": u"caf\xe9", "version": Version("1.0"), "author": u"J\xf6rg"}])
+
+    assert store.row(0) == {"name": u"caf\xe9", "version": "1.0", "author": u"J\xf6rg"}
+    assert ColumnStore.load(store.dumps()).count("author", u"J\xf6rg") == 1
+
+
+def test_search_index():
+    index = SearchIndex([
+        {"name": "Foo-Bar", "version": "1.0", "summary": "Parse and validate versions", "keywords": ["packaging"]},
+        {"name": "bar", "version": "2.0", "summary": "Bars of packaging tools"},
+        {"name": "baz", "version": "1.0", "summary": "Unrelated", "keywords": ["foo"]},
+    ])
+
+    assert len(index) == 3
+    assert index.search("packaging") == [("foo-bar", "1.0"), ("bar", "2.0")]
+    assert index.search("bar packaging") == [("foo-bar", "1.0"), ("bar", "2.0")]
+    assert index.search("foo bar") == [("foo-bar", "1.0")]
+    assert index.search("foo bar", operator="or") == [("foo-bar", "1.0"), ("bar", "2.0"), ("baz", "1.0")]
+    assert index.search("ba*") == [("foo-bar", "1.0"), ("bar", "2.0"), ("baz", "1.0")]
+    assert index.search("ver* pars*") == [("foo-bar", "1.0")]
+    assert index.search("missing") == []
+    assert index.search("") == []
+    assert [release for release, _ in index.top("foo", k=2)] == [("foo-bar", "1.0"), ("baz", "1.0")]
+
+    index.add({"name": "foo_bar", "version": "1.0", "summary": "Rewritten"})
+    assert len(index) == 3
+    assert index.search("packaging") == [("bar", "2.0")]
+    assert index.search("rewritten") == [("foo-bar", "1.0")]
+
+    index.remove("bar", "2.0")
+    index.compact()
+    assert index.search("packaging") == []
+    assert index.search("ba*") == [("baz", "1.0"), ("foo-bar", "1.0")]
+
+    with pytest.raises(KeyError):
+        index.remove("bar", "2.0")
+    with pytest.raises(ValueError):
+        index.search("foo", operator="not")
+
+
+def test_name_index():
+    foo = validators.metadata_record.validate({"name": "Foo_Bar", "version": "1.0", "summary": ""})
+    index = NameIndex([foo, {"name": "foo.bar", "version": "2.0", "summary": ""}])
+
+    assert len(index) == 1
+    assert "FOO-BAR" in index
+    assert VersionPredicate("foo-bar (>=1.0)") in index
+    assert index.name("foo bar") == "Foo_Bar"
+    assert sorted(index.releases(foo)) == ["1.0", "2.0"]
+    assert index.resolve("Foo.Bar (<2.0)") == [foo]
+    assert len(index.resolve(VersionPredicate("foo_bar"))) == 2
+    assert index.resolve("baz") == []
+
+    # Validated metadata is matched on the Version it already holds
+    bar = validators.metadata.validate({"name": "foo_bar", "version": "3.0", "summary": ""})
+    validated = NameIndex([foo, bar])
+    predicate = VersionPredicate("foo-bar (>2.0)")
+    enable_metrics()
+    try:
+        assert validated.resolve(predicate) == [bar]
+        assert get_metrics()["counters"]["versions"] == 0
+    finally:
+        disable_metrics()
+
+    index.remove("foo-bar", "1.0")
+    index.remove("foo-bar", "2.0")
+    assert "foo-bar" not in index
+
+    with pytest.raises(KeyError):
+        index.remove("foo-bar", "2.0")
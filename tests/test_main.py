@@ -0,0 +1,67 @@
+import json
+
+try:
+    # Python 2: takes the native strings main() reads and writes
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+import pytest
+
+from packaging.__main__ import main
+
+
+def run(argv, text):
+    stdout, stderr = StringIO(), StringIO()
+    status = main(argv, stdin=StringIO(text), stdout=stdout, stderr=stderr)
+    return status, stdout.getvalue(), stderr.getvalue()
+
+
+@pytest.mark.parametrize("command", ["normalize", "parse"])
+def test_normalize(command):
+    status, out, err = run([command], "1.0\n1.0-alpha1\n\nwalla walla\nv2.0\n")
+
+    assert status == 1
+    assert out == "1.0\n1.0a1\n2.0\n"
+    assert err == "line 4: invalid version 'walla walla'\n"
+
+
+def test_sort():
+    assert run(["sort"], "1.0\n0.9\n1.0a1\n") == (0, "0.9\n1.0a1\n1.0\n", "")
+    assert run(["sort", "--reverse"], "1.0\n0.9\n") == (0, "1.0\n0.9\n", "")
+    assert run(["sort", "--skip-invalid"], "1.0\nwalla\n0.9\n") == (0, "0.9\n1.0\n", "")
+    assert run(["sort"], "1.0\nwalla\n")[0] == 1
+    assert run(["sort", "--legacy"], "1.0\nwalla\n") == (0, "walla\n1.0\n", "")
+    assert run(["sort", "--unique"], "1.0\n0.9\n1.0.0\n") == (0, "0.9\n1.0\n", "")
+    assert run(["--batch-size", "1", "sort", "--external"], "1.0\n0.9\n") == (0, "0.9\n1.0\n", "")
+    assert run(["sort", "--external"], "1.0\nwalla\n")[0] == 1
+    assert run(["sort", "--unique"], "1.0.99999999999999999999\n1.0\n") == (0, "1.0\n1.0.99999999999999999999\n", "")
+    with pytest.raises(SystemExit):
+        run(["sort", "--external", "--reverse"], "1.0\n")
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_filter(jobs):
+    versions = "\n".join(["1.%d" % i for i in range(20)] + ["2.0", "bad"])
+    status, out, err = run(["--jobs", jobs, "--batch-size", "3", "filter", "--predicate", "foo (>=1.5,<2.0,!=1.7)"], versions)
+
+    assert status == 1
+    assert out.split() == ["1.%d" % i for i in range(5, 20) if i != 7]
+    assert err == "line 22: Invalid version 'bad'\n"
+
+
+def test_filter_bad_predicate():
+    assert run(["filter", "--predicate", ""], "1.0\n")[0] == 2
+
+
+def test_validate():
+    documents = [
+        {"metadata": {"name": "foo", "version": "1.0", "summary": "Foo"}, "dependencies": {"provides": ["foo"]}},
+        {"metadata": {"name": "foo"}, "dependencies": {}},
+    ]
+    status, out, err = run(["validate"], "\n".join([json.dumps(d) for d in documents]) + "\nnot json\n")
+
+    results = [json.loads(line) for line in out.splitlines()]
+    assert status == 1
+    assert [(r["line"], r["valid"]) for r in results] == [(1, True), (2, False), (3, False)]
+    assert err.splitlines() == ["line 2: invalid distribution", "line 3: invalid distribution"]
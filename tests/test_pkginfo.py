@@ -0,0 +1,95 @@
+import pytest
+
+from packaging import pkginfo
+from packaging.validation import validators
+from packaging.version import Version
+
+
+PKG_INFO = b"""Metadata-Version: 1.1
+Name: requests
+Version: 0.14.0
+Summary: Python HTTP for Humans.
+Home-page: http://python-requests.org
+Author: Kenneth Reitz
+Author-email: me@kennethreitz.com
+License: Copyright (c) 2012 Kenneth Reitz.
+        
+        Permission to use, copy, modify.
+Download-URL: UNKNOWN
+Description: Requests: HTTP for Humans
+        =========================
+        
+        Requests is an ISC Licensed HTTP library.
+Keywords: http, ssl, urllib
+Platform: ObscureUnix
+Platform: RareDOS
+Classifier: Development Status :: 5 - Production/Stable
+Classifier: Intended Audience :: Developers
+"""
+
+METADATA = b"""Metadata-Version: 2.1
+Name: packaging
+Version: 0.1
+Summary: Packaging primitives
+Keywords: packages foos
+Project-URL: Bug Tracker, https://github.com/dstufft/packaging/issues
+Supported-Platform: RedHat 7.2
+
+Packaging
+=========
+
+The long description.
+"""
+
+
+def test_parse_pkg_info():
+    assert pkginfo.parse_string(PKG_INFO) == {
+        "name": "requests",
+        "version": "0.14.0",
+        "summary": "Python HTTP for Humans.",
+        "uris": {"Home page": "http://python-requests.org"},
+        "author": "Kenneth Reitz",
+        "author-email": "me@kennethreitz.com",
+        "license": "Copyright (c) 2012 Kenneth Reitz.\n\nPermission to use, copy, modify.",
+        "description": "Requests: HTTP for Humans\n=========================\n\nRequests is an ISC Licensed HTTP library.",
+        "keywords": ["http", "ssl", "urllib"],
+        "platforms": ["ObscureUnix", "RareDOS"],
+        "classifiers": ["Development Status :: 5 - Production/Stable", "Intended Audience :: Developers"],
+    }
+
+
+def test_parse_metadata_body():
+    data = pkginfo.parse_string(METADATA.decode("utf-8"))
+
+    assert data["keywords"] == ["packages", "foos"]
+    assert data["uris"] == {"Bug Tracker": "https://github.com/dstufft/packaging/issues"}
+    assert data["supported-platforms"] == ["RedHat 7.2"]
+    assert data["description"] == "Packaging\n=========\n\nThe long description.\n"
+    assert validators.metadata.validate(data)["version"] == Version("0.1")
+
+
+@pytest.mark.parametrize("threshold", [0, pkginfo.MMAP_THRESHOLD])
+def test_parse_file(tmpdir, monkeypatch, threshold):
+    monkeypatch.setattr(pkginfo, "MMAP_THRESHOLD", threshold)
+    path = tmpdir.join("PKG-INFO")
+    path.write_binary(PKG_INFO)
+
+    assert pkginfo.parse_file(str(path)) == pkginfo.parse_string(PKG_INFO)
+
+
+def test_iter_directory(tmpdir):
+    tmpdir.mkdir("requests.egg-info").join("PKG-INFO").write_binary(PKG_INFO)
+    tmpdir.mkdir("packaging.dist-info").join("METADATA").write_binary(METADATA)
+    tmpdir.mkdir("broken.dist-info").join("METADATA").write_binary(b"Name: broken\n")
+    tmpdir.join("README").write_binary(b"Name: ignored\n")
+
+    results = list(pkginfo.iter_directory(str(tmpdir), validator=validators.metadata))
+
+    assert [r[0][len(str(tmpdir)) + 1:] for r in results] == [
+        "broken.dist-info/METADATA",
+        "packaging.dist-info/METADATA",
+        "requests.egg-info/PKG-INFO",
+    ]
+    assert [r[1] for r in results] == [False, True, True]
+    assert isinstance(results[0][2], validators.SchemaError)
+    assert results[2][2]["name"] == "requests"
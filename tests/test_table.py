@@ -0,0 +1,161 @@
+import multiprocessing
+import sys
+
+import pytest
+
+from packaging.table import VersionTable, build_table, share_mmap, share_memory
+from packaging.utils import normalize_name
+from packaging.version import VersionPredicate, disable_metrics, enable_metrics, get_metrics, sort_versions
+
+
+RELEASES = {
+    "Hey": ["2.5", "2.6", "2.5.1", "2.7a1", "2.4", "2.6.0", "3.0.dev1"],
+    "zope.interface": ["3.5.0", "3.6.0", "4.0"],
+    "empty": [],
+}
+
+
+@pytest.fixture
+def table():
+    return VersionTable(build_table(RELEASES))
+
+
+def test_versions(table):
+    assert len(table) == 3
+    assert table.projects() == ["empty", "Hey", "zope.interface"]
+    assert "Hey" in table
+    assert "HEY" in table
+    assert "zope-interface" in table
+    assert "hey-there" not in table
+    assert table.versions("Hey") == sort_versions(RELEASES["Hey"])
+    assert table.versions("empty") == []
+
+    with pytest.raises(KeyError):
+        table.versions("missing")
+
+
+def test_latest(table):
+    assert table.latest("Hey") == "3.0.dev1"
+    assert table.latest("Hey", final=True) == "2.6.0"
+    assert table.latest("empty") is None
+
+
+@pytest.mark.parametrize("predicate", [
+    "Hey",
+    "Hey (>=2.5,<2.7)",
+    "Hey (<=2.6)",
+    "Hey (>2.6,!=2.7a1)",
+    "Hey (==2.6)",
+    "Hey (2.5)",
+    "Hey (>=2.5,2.5)",
+    "Hey (2.6.0)",
+    "Hey (2.7a1)",
+    "Hey (>3.0)",
+    "Missing (>1.0)",
+    "hey (>=2.5)",
+    "Zope_Interface (3.6)",
+])
+def test_match(table, predicate):
+    predicate = VersionPredicate(predicate)
+    names = dict([(normalize_name(name), name) for name in RELEASES])
+    expected = [v for v in sort_versions(RELEASES.get(names.get(predicate.key), [])) if predicate.match(v)]
+
+    assert table.match(predicate) == expected
+
+
+def test_match_does_not_parse(table):
+    predicate = VersionPredicate("Hey (>=2.5,2.5,!=2.5.1)")
+
+    enable_metrics()
+    try:
+        assert table.match(predicate) == ["2.5"]
+        assert get_metrics()["counters"]["versions"] == 0
+    finally:
+        disable_metrics()
+
+
+def test_invalid_versions():
+    with pytest.raises(ValueError):
+        build_table({"foo": ["1.0", "walla"]})
+
+    table = VersionTable(build_table({"foo": ["1.0", "walla"]}, skip_invalid=True))
+    assert table.versions("foo") == ["1.0"]
+
+    with pytest.raises(ValueError):
+        VersionTable(b"nope" + b"\x00" * 4)
+
+
+def test_fuzzy_series():
+    table = VersionTable(build_table({"foo": ["v1.0", "1.0.0", "1.0.1", "1.1", "2.0rc1"]}, fuzzy=True))
+
+    assert table.match("foo (1.0)") == ["v1.0", "1.0.0", "1.0.1"]
+    assert table.match("foo (1.0.0)") == ["1.0.0"]
+    assert table.match("foo (>=1.0)") == ["v1.0", "1.0.0", "1.0.1", "1.1", "2.0rc1"]
+    assert table.match("foo (2.0)") == []
+    assert table.latest("foo", final=True) == "1.1"
+
+
+def test_normalized_names():
+    table = VersionTable(build_table({"Foo_Bar": ["1.0"], "foo.bar": ["2.0"]}))
+
+    assert len(table) == 1
+    assert table.projects() == ["Foo_Bar"]
+    assert table.versions("FOO-BAR") == ["1.0", "2.0"]
+
+
+def test_large_numbers():
+    versions = ["1.0.99999999999999999999", "1.0.5", "1.0.%d" % 2 ** 64, "2.0"]
+    table = VersionTable(build_table({"foo": versions}))
+
+    assert table.versions("foo") == sort_versions(versions)
+    assert table.match("foo (>1.0.5,<2.0)") == ["1.0.%d" % 2 ** 64, "1.0.99999999999999999999"]
+
+
+def _latest_in_child(buffer, queue):
+    queue.put(VersionTable(buffer).latest("zope.interface"))
+
+
+@pytest.mark.skipif(not hasattr(multiprocessing, "get_context") or sys.platform == "win32", reason="requires fork")
+def test_share_mmap():
+    shared = share_mmap(build_table(RELEASES))
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+
+    process = context.Process(target=_latest_in_child, args=(shared, queue))
+    process.start()
+    assert queue.get(timeout=10) == "4.0"
+    process.join()
+
+
+@pytest.mark.skipif(not hasattr(memoryview, "release"), reason="requires Python 3.2+")
+def test_close():
+    with VersionTable(build_table(RELEASES)) as table:
+        assert table.latest("Hey") == "3.0.dev1"
+
+    with pytest.raises(ValueError):
+        table.latest("Hey")
+
+
+def _attach_in_child(name, queue):
+    with VersionTable.attach(name) as table:
+        queue.put(table.match("zope.interface (>3.5.0)"))
+
+
+def test_share_memory():
+    pytest.importorskip("multiprocessing.shared_memory")
+
+    block = share_memory(build_table(RELEASES))
+    try:
+        table = VersionTable.attach(block.name)
+        assert table.match("zope.interface (>3.5.0)") == ["3.6.0", "4.0"]
+        table.close()
+
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=_attach_in_child, args=(block.name, queue))
+        process.start()
+        assert queue.get(timeout=10) == ["3.6.0", "4.0"]
+        process.join()
+        assert process.exitcode == 0
+    finally:
+        block.close()
+        block.unlink()
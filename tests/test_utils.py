@@ -0,0 +1,17 @@
+import pytest
+
+from packaging.utils import normalize_name
+from packaging.version import VersionPredicate
+
+
+@pytest.mark.parametrize(("name", "expected"), [
+    ("foo", "foo"),
+    ("Foo_Bar", "foo-bar"),
+    ("foo.bar", "foo-bar"),
+    ("FOO - bar", "foo-bar"),
+    ("zope.interface", "zope-interface"),
+    ("foo__-bar", "foo-bar"),
+])
+def test_normalize_name(name, expected):
+    assert normalize_name(name) == expected
+    assert VersionPredicate("%s (>=1.0)" % name).key == expected
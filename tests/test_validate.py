@@ -1,6 +1,18 @@
+import pickle
+
+try:
+    # Python 2: takes the native strings json.dumps() returns
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
 import pytest
 
 from packaging.validation import validators
+from packaging.validation.deltas import DeltaStore
+from packaging.validation.classifiers import Classifiers, index
+from packaging.validation.schema import And, Optional, Schema, Use
+from packaging.validation.tiers import TieredValidator
 from packaging.version import Version, VersionPredicate
 
 
@@ -50,7 +62,9 @@ from packaging.version import Version, VersionPredicate
     (validators.metadata_supported_platforms, ["RedHat 7.2", "i386-win32-2791"], ["RedHat 7.2", "i386-win32-2791"]),
 
     # dependencies/python
-    (validators.dependencies_python, ">=2.6", ">=2.6"),
+    (validators.dependencies_python, ">=2.6", VersionPredicate("python (>=2.6)")),
+    (validators.dependencies_python, ">=2.6,<3.0", VersionPredicate("python (>=2.6,<3.0)")),
+    (validators.dependencies_python, "2.7", VersionPredicate("python (2.7)")),
 
     # dependencies/extras
     (validators.dependencies_extras, ["tests", "docs"], ["tests", "docs"]),
@@ -112,6 +126,7 @@ def test_metadata_fields_valid(validator, inp, expected):
     # metadata/classifiers
     (validators.metadata_classifiers, None),
     (validators.metadata_classifiers, "Development Status :: 5 - Production/Stable"),
+    (validators.metadata_classifiers, ["Development Status :: 8 - Unknown"]),
 
     # metadata/uris
     (validators.metadata_uris, None),
@@ -127,6 +142,8 @@ def test_metadata_fields_valid(validator, inp, expected):
 
     # dependencies/python
     (validators.dependencies_python, None),
+    (validators.dependencies_python, ">=2.6a"),
+    (validators.dependencies_python, "python >= 2.6"),
 
     # dependencies/extras
     (validators.dependencies_extras, None),
@@ -154,3 +171,243 @@ def test_metadata_fields_valid(validator, inp, expected):
 def test_metadata_fields_invalid(validator, inp):
     with pytest.raises(validators.SchemaError):
         validator.validate(inp)
+
+
+DISTRIBUTION = {
+    "metadata": {
+        "name": "packaging",
+        "version": "0.1",
+        "summary": "Packaging primitives",
+        "license": "Apache License, Version 2.0",
+        "author-email": "donald.stufft@gmail.com",
+        "classifiers": ["Intended Audience :: Developers"],
+        "uris": {"Home page": "https://github.com/dstufft/packaging/"},
+    },
+    "dependencies": {
+        "requires": ["zope.interface (>3.5.0)"],
+        "provides": ["packaging (0.1)"],
+    },
+}
+
+
+def test_record_equality():
+    without = validators.dependencies_record.validate({"provides": []})
+    with_python = validators.dependencies_record.validate({"provides": [], "python": ">=2.6"})
+
+    assert with_python != without
+    assert without != with_python
+    assert with_python == validators.dependencies_record.validate({"provides": [], "python": ">=2.6"})
+    assert without == validators.dependencies_record.validate({"provides": []})
+
+
+def test_distribution_record():
+    record = validators.distribution_record.validate(DISTRIBUTION)
+
+    assert record.metadata.name == "packaging"
+    assert record.metadata.version == Version("0.1")
+    assert record.metadata.author_email == "donald.stufft@gmail.com"
+    assert record.metadata.classifiers == ("Intended Audience :: Developers",)
+    assert record.metadata.maintainer is None
+    assert record.metadata.key == "packaging"
+    assert record.metadata.classifier_mask == index.encode(["Intended Audience :: Developers"])
+    assert record.dependencies.requires == (VersionPredicate("zope.interface (>3.5.0)"),)
+    assert record.as_dict() == validators.distribution.validate(DISTRIBUTION)
+
+
+def test_record_interns_repetitive_fields():
+    first = validators.metadata_record.validate(dict(DISTRIBUTION["metadata"], license="".join(["Apache License, ", "Version 2.0"])))
+    second = validators.metadata_record.validate(dict(DISTRIBUTION["metadata"], license="".join(["Apache License, ", "Version 2.0"])))
+
+    assert first == second
+    assert first.license is second.license
+    assert first.classifiers[0] is second.classifiers[0]
+
+
+def test_record_pickle():
+    record = validators.metadata_record.validate(dict(DISTRIBUTION["metadata"], name="Zope.Interface"))
+    loaded = pickle.loads(pickle.dumps(record))
+
+    assert loaded == record
+    assert loaded.key == "zope-interface"
+
+
+def test_record_invalid():
+    with pytest.raises(validators.SchemaError):
+        validators.metadata_record.validate({"name": "packaging"})
+
+
+def test_classifier_index():
+    assert "Intended Audience :: Developers" in index
+    assert "Intended Audience :: Nobody" not in index
+    assert "Programming Language :: Python :: 3" in index.startswith("Programming Language :: Python :: 3")
+    assert "Programming Language :: Python :: 2.7" not in index.startswith("Programming Language :: Python :: 3")
+
+
+def test_classifier_encoding():
+    classifiers = Classifiers(["Topic :: B", "Topic :: A", "Topic :: C :: D"])
+
+    assert len(classifiers) == 3
+    assert list(classifiers) == ["Topic :: A", "Topic :: B", "Topic :: C :: D"]
+    assert classifiers.id("Topic :: A") == 1
+    assert classifiers.encode(["Topic :: C :: D", "Topic :: A"]) == 0b110
+    assert classifiers.decode(0b101) == ["Topic :: B", "Topic :: C :: D"]
+    assert classifiers.prefix_mask("Topic :: C") == 0b100
+
+    # Ids are positions in the list, so appending keeps existing ones
+    appended = Classifiers(["Topic :: B", "Topic :: A", "Topic :: C :: D", "Topic :: AA"])
+    assert appended.encode(["Topic :: C :: D", "Topic :: A"]) == 0b110
+    assert appended.startswith("Topic :: A") == ["Topic :: A", "Topic :: AA"]
+
+    with pytest.raises(ValueError):
+        classifiers.id("Topic :: E")
+
+
+def test_validate_without_copy():
+    schema = Schema(validators.distribution, copy=False)
+    validated = schema.validate(DISTRIBUTION)
+
+    assert validated == validators.distribution.validate(DISTRIBUTION)
+    # Transformed parts are rebuilt...
+    assert validated is not DISTRIBUTION
+    assert validated["metadata"]["version"] == Version("0.1")
+    # ...the rest is returned as is
+    assert validated["metadata"]["classifiers"] is DISTRIBUTION["metadata"]["classifiers"]
+    assert validated["metadata"]["uris"] is DISTRIBUTION["metadata"]["uris"]
+
+
+def test_validate_without_copy_in_place():
+    data = {"a": ["b", "c"], "d": {"e": 1}}
+    schema = Schema({"a": [str], Optional("d"): {str: int}}, copy=False)
+
+    assert schema.validate(data) is data
+
+    with pytest.raises(validators.SchemaError):
+        schema.validate({"a": ["b", 2]})
+
+    with pytest.raises(validators.SchemaError):
+        schema.validate({"a": ["b"], "f": 1})
+
+
+def test_validate_structural():
+    schema = Schema(validators.distribution, structural=True)
+
+    assert schema.validate(DISTRIBUTION) is DISTRIBUTION
+
+    # Versions, classifiers and predicates are not checked...
+    bad = {
+        "metadata": dict(DISTRIBUTION["metadata"], version="walla walla", classifiers=["Nope"]),
+        "dependencies": dict(DISTRIBUTION["dependencies"], requires=["(((("]),
+    }
+    assert schema.validate(bad) is bad
+    with pytest.raises(validators.SchemaError):
+        validators.distribution.validate(bad)
+
+    # ...types and keys are
+    for invalid in [
+        {"metadata": dict(DISTRIBUTION["metadata"], summary=1), "dependencies": DISTRIBUTION["dependencies"]},
+        {"metadata": {"name": "packaging", "version": "1.0"}, "dependencies": DISTRIBUTION["dependencies"]},
+        {"metadata": dict(DISTRIBUTION["metadata"], unknown="x"), "dependencies": DISTRIBUTION["dependencies"]},
+        {"metadata": dict(DISTRIBUTION["metadata"], keywords="a b"), "dependencies": DISTRIBUTION["dependencies"]},
+    ]:
+        with pytest.raises(validators.SchemaError):
+            schema.validate(invalid)
+
+
+def test_validate_structural_and_use():
+    # Whatever follows a Use checks its result, not the raw data
+    schema = And(str, Use(float), float)
+    assert Schema(schema).validate("1.5") == 1.5
+    assert Schema(schema, structural=True).validate("1.5") == "1.5"
+
+    with pytest.raises(validators.SchemaError):
+        Schema(schema, structural=True).validate(1.5)
+
+
+class AlwaysSample(object):
+
+    def random(self):
+        return 0.0
+
+
+def test_tiered_validator():
+    validator = TieredValidator(validators.distribution, sample_rate=1.0, rng=AlwaysSample())
+    bad = {"metadata": dict(DISTRIBUTION["metadata"], version="walla walla"), "dependencies": DISTRIBUTION["dependencies"]}
+
+    assert validator.validate(DISTRIBUTION) is DISTRIBUTION
+    assert validator.validate(bad) is bad
+    with pytest.raises(validators.SchemaError):
+        validator.validate({"metadata": {}, "dependencies": DISTRIBUTION["dependencies"]})
+
+    report = validator.report()
+    assert len(report.pop("errors")) == 2
+    assert report == {"validated": 3, "structural_failures": 1, "sampled": 2, "full_failures": 1}
+
+    validator.strict = True
+    with pytest.raises(validators.SchemaError):
+        validator.validate(bad)
+
+    assert TieredValidator(validators.distribution).validate(bad) is bad
+    with pytest.raises(ValueError):
+        TieredValidator(validators.distribution, sample_rate=2)
+
+
+def release(version, **changes):
+    document = {
+        "metadata": dict(DISTRIBUTION["metadata"], version=version),
+        "dependencies": dict(DISTRIBUTION["dependencies"]),
+    }
+    for key, value in changes.items():
+        section, key = key.split("__")
+        if value is None:
+            del document[section][key.replace("_", "-")]
+        else:
+            document[section][key.replace("_", "-")] = value
+    return document
+
+
+def test_delta_store():
+    store = DeltaStore()
+    store.add(release("0.1"))
+    errors = store.extend([
+        release("0.2", dependencies__requires=["zope.interface (>3.6.0)"]),
+        release("0.3", dependencies__requires=["zope.interface (>3.6.0)"], metadata__license=None),
+        release("walla walla"),
+        release("0.4", metadata__summary=None),
+        release("0.5", metadata__unknown="x"),
+        release("0.6", dependencies__requires=["(((("]),
+        {"metadata": release("0.7")["metadata"]},
+    ])
+
+    assert errors[:2] == [None, None]
+    assert all([isinstance(e, validators.SchemaError) for e in errors[2:]])
+    assert len(store) == 3
+    assert store.versions("PACKAGING") == ["0.1", "0.2", "0.3"]
+    assert ("packaging", "0.2") in store
+
+    for version, document in [("0.1", release("0.1")), ("0.3", release("0.3", dependencies__requires=["zope.interface (>3.6.0)"], metadata__license=None))]:
+        assert store.get("packaging", version) == document
+
+    # Rebuilt documents are copies
+    store.get("packaging", "0.1")["metadata"]["name"] = "changed"
+    assert store.get("packaging", "0.1") == release("0.1")
+
+    with pytest.raises(validators.SchemaError):
+        store.add(release("0.1", metadata__version="0.1", metadata__summary=1))
+
+    store.add(release("0.1", metadata__summary="Replaced"))
+    assert store.get("packaging", "0.1")["metadata"]["summary"] == "Replaced"
+
+    buffer = StringIO()
+    store.dump(buffer)
+    buffer.seek(0)
+    loaded = DeltaStore.load(buffer)
+    assert [loaded.get("packaging", v) for v in loaded.versions("packaging")] == [store.get("packaging", v) for v in store.versions("packaging")]
+
+    store.remove("packaging", "0.1")
+    assert store.get("packaging", "0.2")["metadata"]["version"] == "0.2"
+    store.remove("packaging", "0.2")
+    store.remove("packaging", "0.3")
+    assert store.projects() == []
+
+    with pytest.raises(KeyError):
+        store.get("packaging", "0.1")
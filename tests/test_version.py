@@ -1,7 +1,9 @@
 import pytest
 
 from packaging.version import Version as V
-from packaging.version import VersionPredicate, suggest
+from packaging.version import LegacyVersion, VersionPredicate, parse, suggest, _Regex
+from packaging.version import sort_versions, max_version, dedupe_versions, external_sort_versions
+from packaging.version import enable_metrics, disable_metrics, get_metrics, reset_metrics
 
 
 VERSIONS = [
@@ -53,6 +55,48 @@ def test_irrational_versions(version):
         V(version)
 
 
+def test_hash_trailing_zero():
+    assert hash(V("1.0")) == hash(V("1.0.0"))
+    assert len(set([V("1.0"), V("1.0.0"), V("1.0.1")])) == 2
+
+
+@pytest.mark.parametrize(("version", "cls"), [
+    ("1.0", V),
+    ("1.0.post1", V),
+    ("1", LegacyVersion),
+    ("1.0-beta", LegacyVersion),
+    ("walla walla", LegacyVersion),
+])
+def test_parse(version, cls):
+    assert type(parse(version)) is cls
+    assert str(parse(version)) == version
+
+
+@pytest.mark.parametrize(("left", "right"), [
+    # Same ordering as setuptools
+    ("0.5-r3", "0.5"),
+    ("1.0-alpha", "1.0-beta"),
+    ("1.0-beta", "1.0-rc1"),
+    ("1.0-rc1", "1.0-final"),
+    ("1.0-final", "1.0-r1"),
+    ("1.0-dev", "1.0-alpha"),
+    # Always before valid versions
+    ("9999", "0.1"),
+    ("zzz", "0.0.dev0"),
+])
+def test_legacy_ordering(left, right):
+    assert parse(left) < parse(right)
+    assert not parse(right) < parse(left)
+    assert parse(left) != parse(right)
+
+
+def test_legacy_equality():
+    assert LegacyVersion("1.0-Final") == LegacyVersion("1.0-final")
+    assert hash(LegacyVersion("1.0-Final")) == hash(LegacyVersion("1.0-final"))
+    assert LegacyVersion("1.0-final") != LegacyVersion("1.0final")
+    assert LegacyVersion("1.0") != V("1.0")
+
+
 def test_huge_version():
     assert str(V("1980.0")) == "1980.0"
 
@@ -199,6 +243,8 @@ def test_invalid_predicate_raises():
 
     ("Hey (2.5)", "2.55", False),
     ("Hey (2.5)", "2.5.5a1", False),
+    ("Hey (2.5)", "2.5.1.post1", False),
+    ("Hey (2.5.0)", "2.5", False),
     ("Hey (<=2.5)", "2.5.9", False),
     ("Hey (>=2.5,!=2.6,<2.7)", "2.6", False),
     ("Ho (<3.0,!=2.6)", "2.6.0", False),
@@ -223,3 +269,130 @@ def test_micro_predicate():
     predicate = VersionPredicate("zope.event (3.4.0)")
     assert predicate.match("3.4.0")
     assert not predicate.match("3.4.1")
+
+
+def test_metrics():
+    assert get_metrics() is None
+
+    enable_metrics()
+    try:
+        V("1.0") < V("2.0")
+        suggest("1.0-alpha1")
+        with pytest.raises(ValueError):
+            V("1.0-invalid")
+
+        counters = get_metrics()["counters"]
+        # suggest() fails to parse the original and parses the suggestion,
+        # only Versions actually built are counted
+        assert counters == {"versions": 3, "parse_errors": 2, "comparisons": 1, "suggest": 1}
+
+        reset_metrics()
+        assert get_metrics() == {
+            "counters": {"versions": 0, "parse_errors": 0, "comparisons": 0, "suggest": 0},
+            "timings": {},
+        }
+    finally:
+        disable_metrics()
+
+    V("1.0")
+    assert get_metrics() is None
+
+
+def test_metrics_timings():
+    enable_metrics(timings=True)
+    try:
+        V("1.0")
+        V("1.1")
+        suggest("1.0")
+
+        timings = get_metrics()["timings"]
+        assert timings["parse"]["count"] == 3
+        assert sum(timings["parse"]["buckets"].values()) == 3
+        assert timings["suggest"]["count"] == 1
+    finally:
+        disable_metrics()
+
+
+def test_sort_versions():
+    versions = ["1.0", "1.0a1", "1.0.post456", "0.9", "1.0.dev456", "1.0c1", "1.0.0"]
+
+    assert sort_versions(versions) == ["0.9", "1.0a1", "1.0c1", "1.0.dev456", "1.0", "1.0.0", "1.0.post456"]
+    assert sort_versions(versions) == [str(v) for v in sorted([V(v) for v in versions])]
+    assert sort_versions(versions, reverse=True)[0] == "1.0.post456"
+
+
+def test_sort_versions_invalid():
+    versions = ["1.0", "walla walla washington", "v2.0", "1.0-alpha1"]
+
+    with pytest.raises(ValueError):
+        sort_versions(versions)
+
+    assert sort_versions(versions, skip_invalid=True) == ["1.0"]
+    assert sort_versions(versions, skip_invalid=True, fuzzy=True) == ["1.0-alpha1", "1.0", "v2.0"]
+
+    with pytest.raises(ValueError):
+        sort_versions(versions, fuzzy=True)
+
+
+def test_max_version():
+    assert max_version(["1.0", "2.0b1", "1.9.post3"]) == "2.0b1"
+    assert max_version(["1.0", "walla"], skip_invalid=True) == "1.0"
+    assert max_version([]) is None
+
+
+def test_sort_versions_legacy():
+    versions = ["1.0", "walla walla", "0.9", "2.0-final", "1.0.0", "0.5-r3"]
+
+    assert sort_versions(versions, legacy=True) == ["walla walla", "0.5-r3", "2.0-final", "0.9", "1.0", "1.0.0"]
+    assert sort_versions(versions, legacy=True) == [str(v) for v in sorted([parse(v) for v in versions])]
+    assert max_version(["walla", "0.1"], legacy=True) == "0.1"
+    assert max_version(["walla", "zzz"], legacy=True) == "zzz"
+    assert dedupe_versions(["1.0", "1.0-final", "1.0-FINAL", "1.0.0"], legacy=True) == ["1.0", "1.0-final"]
+
+
+def test_dedupe_versions():
+    assert dedupe_versions(["1.0", "1.1", "1.0.0", "1.1.0.0", "1.2"]) == ["1.0", "1.1", "1.2"]
+    assert dedupe_versions(["1.0", "v1.0.0"], fuzzy=True) == ["1.0"]
+
+
+@pytest.mark.parametrize("run_size", [None, 1, 2, 3, 100])
+def test_external_sort_versions(run_size, tmpdir):
+    versions = ["1.0", "1.0a1", "1.0.post456", "0.9", "1.0.dev456", "1.0c1", "1.0.0", "0.9", "2.0"]
+
+    def external(rows, **kwargs):
+        return list(external_sort_versions(rows, run_size=run_size, directory=str(tmpdir), **kwargs))
+
+    assert external(versions) == sort_versions(sorted(versions))
+    assert external(versions, dedupe=True) == ["0.9", "1.0a1", "1.0c1", "1.0.dev456", "1.0", "1.0.post456", "2.0"]
+    assert external([]) == []
+
+    pairs = [("foo", "1.0"), ("foo-bar", "0.1"), ("foo", "0.9"), ("foo", "1.0.0"), ("bar", "3.0")]
+    assert external(pairs, dedupe=True) == [("bar", "3.0"), ("foo", "0.9"), ("foo", "1.0"), ("foo-bar", "0.1")]
+
+    with pytest.raises(ValueError):
+        external(["1.0", "walla"])
+    assert external(["1.0", "walla", "v0.5"], skip_invalid=True, fuzzy=True) == ["v0.5", "1.0"]
+
+    # Temporary files are cleaned up
+    assert tmpdir.listdir() == []
+
+
+def test_external_sort_versions_large_numbers():
+    versions = ["1.0.99999999999999999999", "1.0.%d" % 2 ** 64, "1.0.18446744073709551615", "1.0.5", "256.0"]
+
+    assert list(external_sort_versions(versions, run_size=2)) == sort_versions(versions)
+    assert list(external_sort_versions(["1.%d" % 2 ** 64, "1.%d.0" % 2 ** 64], dedupe=True)) == ["1.%d" % 2 ** 64]
+
+    with pytest.raises(ValueError):
+        list(external_sort_versions(["1.%d" % 2 ** 2048]))
+
+
+def test_lazy_regex():
+    regex = _Regex(r"(\d+)\.(\d+)")
+    assert regex._compiled is None
+
+    assert regex.match("1.2").groups() == ("1", "2")
+    # Later calls skip __getattr__ and go straight to the compiled pattern
+    assert regex.__dict__["match"] == regex._compiled.match
+    assert regex.match("3.4").groups() == ("3", "4")
+    assert regex.search("x5.6").groups() == ("5", "6")